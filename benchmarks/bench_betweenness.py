@@ -0,0 +1,38 @@
+# Benchmark: sampled vs. exact betweenness centrality on Watts-Strogatz graphs
+# Run from the repository root: python -m benchmarks.bench_betweenness
+import time
+
+import networkx as nx
+
+from divvy_network.centrality import approximate_betweenness_centrality, betweenness_centrality
+
+# (nodes, k, p) configurations; exact Brandes is the slow part, so sizes stay moderate
+graph_sizes = [(2000, 4, 0.3), (4000, 4, 0.3)]
+epsilons = [0.05, 0.03]
+pivot_counts = [100, 300]
+
+def compare(name, exact, approx, elapsed, exact_elapsed):
+    max_error = max(abs(exact[v] - approx[v]) for v in exact)
+    top_exact = max(exact, key=exact.get)
+    top_approx = max(approx, key=approx.get)
+    print(f"  {name:<14} {elapsed:8.2f}s  speedup {exact_elapsed / elapsed:5.1f}x  "
+          f"max abs error {max_error:.5f}  top node {'match' if top_exact == top_approx else 'differs'} "
+          f"(exact value of chosen node {exact[top_approx]:.5f} vs {exact[top_exact]:.5f})")
+
+if __name__ == '__main__':
+    for n, k, p in graph_sizes:
+        G = nx.watts_strogatz_graph(n, k, p, seed=42)
+        start = time.perf_counter()
+        exact = nx.betweenness_centrality(G)
+        exact_elapsed = time.perf_counter() - start
+        print(f"Watts-Strogatz n={n}, k={k}, p={p}: exact {exact_elapsed:.2f}s")
+
+        for epsilon in epsilons:
+            start = time.perf_counter()
+            approx = approximate_betweenness_centrality(G, epsilon=epsilon, delta=0.1, seed=42)
+            compare(f"epsilon={epsilon}", exact, approx, time.perf_counter() - start, exact_elapsed)
+
+        for pivots in pivot_counts:
+            start = time.perf_counter()
+            approx = betweenness_centrality(G, approximate=True, k=pivots, seed=42)
+            compare(f"pivots={pivots}", exact, approx, time.perf_counter() - start, exact_elapsed)
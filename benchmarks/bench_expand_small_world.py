@@ -0,0 +1,81 @@
+# Benchmark: indexed edge lookup vs. the old per-neighbor scan in expand_small_world_graph
+# Run from the repository root: python -m benchmarks.bench_expand_small_world
+import random
+import time
+
+import networkx as nx
+import pandas as pd
+
+from divvy_network.trip_graph import generate_station_trip_edges, build_trip_edge_index, expand_small_world_graph
+
+file_path = 'Divvy_Trips_20240503_17k.csv'
+
+# The original implementation, kept here only as the baseline to compare against
+def expand_small_world_graph_scan(G, station_trip_edges, new_nodes, k):
+    num_existing_nodes = len(G.nodes)
+    total_nodes = num_existing_nodes + new_nodes
+    G.add_nodes_from(range(num_existing_nodes, total_nodes))
+    for node in range(num_existing_nodes, total_nodes):
+        for i in range(1, (k // 2) + 1):
+            neighbor = (node + i) % total_nodes
+            reverse_neighbor = (node - i) % total_nodes
+            for edge in station_trip_edges:
+                if edge[0] == node and edge[1] == neighbor:
+                    G.add_edge(node, neighbor, weight=edge[2])
+                if edge[0] == node and edge[1] == reverse_neighbor:
+                    G.add_edge(node, reverse_neighbor, weight=edge[2])
+    return G
+
+# Function to build a synthetic edge list over num_nodes nodes with num_edges trip pairs
+def synthetic_trip_edges(num_nodes, num_edges, seed=0):
+    rng = random.Random(seed)
+    edges = []
+    for _ in range(num_edges):
+        node = rng.randrange(num_nodes)
+        # Bias towards ring neighbours so the lookups actually hit
+        offset = rng.choice([-1, 1, rng.randrange(1, num_nodes)])
+        edges.append((node, (node + offset) % num_nodes, rng.randint(1, 50)))
+    return edges
+
+# Function to time both variants when growing an empty graph by new_nodes nodes
+def time_growth(station_trip_edges, new_nodes, scan_nodes, k=3):
+    start = time.perf_counter()
+    edge_index = build_trip_edge_index(station_trip_edges)
+    index_build = time.perf_counter() - start
+
+    # p=0 disables rewiring so only the edge lookup is measured
+    start = time.perf_counter()
+    G_indexed = expand_small_world_graph(nx.Graph(), edge_index, new_nodes, k, 0)
+    indexed = time.perf_counter() - start
+
+    # The scan is far too slow to run on every node, so time it on a prefix and scale per node
+    start = time.perf_counter()
+    expand_small_world_graph_scan(nx.Graph(), station_trip_edges, scan_nodes, k)
+    scan_per_node = (time.perf_counter() - start) / scan_nodes
+
+    return index_build, indexed, scan_per_node * new_nodes, G_indexed
+
+def report(name, num_edges, new_nodes, index_build, indexed, scan_estimate):
+    print(f"{name}: {num_edges} edges, {new_nodes} new nodes")
+    print(f"  index build:     {index_build:.4f}s")
+    print(f"  indexed growth:  {indexed:.4f}s")
+    print(f"  scan (estimate): {scan_estimate:.4f}s")
+    print(f"  speedup:         {scan_estimate / max(indexed + index_build, 1e-9):.1f}x")
+
+if __name__ == '__main__':
+    divvy_data = pd.read_csv(file_path, usecols=['FROM STATION ID', 'TO STATION ID'])
+    station_ids = pd.unique(divvy_data[['FROM STATION ID', 'TO STATION ID']].values.ravel('K'))
+    station_labels = {i: int(station_id) for i, station_id in enumerate(station_ids)}
+    divvy_edges = generate_station_trip_edges(divvy_data, station_labels)
+
+    # Sanity check: both variants must produce the same graph
+    G_scan = expand_small_world_graph_scan(nx.Graph(), divvy_edges, len(station_labels), 3)
+    _, _, _, G_indexed = time_growth(divvy_edges, len(station_labels), 1)
+    assert sorted(G_scan.edges(data='weight')) == sorted(G_indexed.edges(data='weight'))
+
+    results = time_growth(divvy_edges, len(station_labels), 50)
+    report("Bundled 17k CSV", len(divvy_edges), len(station_labels), *results[:3])
+
+    synthetic_edges = synthetic_trip_edges(100000, 1000000)
+    results = time_growth(synthetic_edges, 100000, 3)
+    report("Synthetic", len(synthetic_edges), 100000, *results[:3])
@@ -0,0 +1,29 @@
+# Benchmark: per-cluster analysis with 1..N worker processes
+# Run from the repository root: python -m benchmarks.bench_parallel_clusters
+import os
+import time
+
+import networkx as nx
+
+from divvy_network.cluster_analysis import cluster_metrics
+
+# 64 disjoint sparse clusters of 150 nodes each; every one needs betweenness
+num_clusters = 64
+cluster_size = 150
+
+if __name__ == '__main__':
+    G = nx.disjoint_union_all([nx.watts_strogatz_graph(cluster_size, 2, 0.1, seed=i) for i in range(num_clusters)])
+    clusters = [list(range(i * cluster_size, (i + 1) * cluster_size)) for i in range(num_clusters)]
+
+    worker_counts = sorted({1, 2, 4, 8, os.cpu_count() or 1})
+    print(f"{num_clusters} clusters x {cluster_size} nodes, {os.cpu_count()} CPUs available")
+
+    serial = None
+    for workers in worker_counts:
+        start = time.perf_counter()
+        metrics = cluster_metrics(G, clusters, betweenness_when=(None, None, 2), workers=workers)
+        elapsed = time.perf_counter() - start
+        if serial is None:
+            serial = (metrics, elapsed)
+        assert metrics == serial[0], "parallel results differ from serial"
+        print(f"  workers={workers:<3} {elapsed:7.2f}s  speedup {serial[1] / elapsed:5.2f}x")
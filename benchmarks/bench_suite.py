@@ -0,0 +1,197 @@
+# Benchmark suite: loaders, generators and metrics at 10^2 .. 10^5 nodes with fixed seeds
+# Run from the repository root: python -m benchmarks.bench_suite [--sizes 100 1000] [--cases ...]
+# Each case is timed (best of a few repeats, setup excluded) and its result summary is compared
+# with benchmarks/baseline.json; --save-baseline records the current numbers instead. Exits with
+# status 1 when a case's result changed. Baseline timings come from whichever machine saved them,
+# so a case slower than REGRESSION_RATIO x its baseline is only reported as a warning, unless
+# --fail-on-slower is given (use it with a baseline saved on the same machine).
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+
+from divvy_network.centrality import betweenness_centrality
+from divvy_network.communities import girvan_newman_communities
+from divvy_network.divvy_loader import load_trip_pair_counts, DEFAULT_FILE_PATH
+from divvy_network.path_length import average_path_length
+from divvy_network.trip_graph import generate_station_trip_edges, build_trip_edge_index, expand_small_world_graph
+from divvy_network.watts_strogatz import watts_strogatz_graph
+
+SEED = 0
+SIZES = [100, 1_000, 10_000, 100_000]
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+# A case this many times slower than its baseline is flagged as slower (timings are noisy)
+REGRESSION_RATIO = 1.5
+# Repeats stop once a case has used this many seconds (at least one run always happens)
+REPEAT_BUDGET_SECONDS = 2.0
+MAX_REPEATS = 5
+TRIPS_PER_STATION = 10
+
+# Function to draw a synthetic trip table over num_stations stations with a fixed seed
+# Most trips go to nearby station IDs, like real rides between neighboring stations.
+def synthetic_trips(num_stations, trips_per_station=TRIPS_PER_STATION, seed=SEED):
+    rng = np.random.default_rng(seed)
+    num_trips = num_stations * trips_per_station
+    src = rng.integers(0, num_stations, size=num_trips)
+    offsets = np.rint(rng.normal(0, 3, size=num_trips)).astype(np.int64)
+    dst = (src + offsets) % num_stations
+    return pd.DataFrame({
+        'TRIP ID': np.arange(num_trips),
+        'TRIP DURATION': rng.integers(60, 3600, size=num_trips),
+        'FROM STATION ID': src,
+        'TO STATION ID': dst,
+    })
+
+# Function to map node i to synthetic station i, so ring-lattice neighbors are nearby stations
+def _station_labels(trips):
+    num_stations = int(max(trips['FROM STATION ID'].max(), trips['TO STATION ID'].max())) + 1
+    return {i: i for i in range(num_stations)}
+
+def _ws_graph(n, k=4, p=0.1):
+    return watts_strogatz_graph(n, k, p, seed=SEED)
+
+# Each case: setup(n) builds the (untimed) inputs, run(*inputs) is timed and returns a result
+# summary that must match the baseline; max_size keeps quadratic algorithms to feasible sizes.
+def _setup_csv(n, tmp_dir):
+    if n is None:
+        return (DEFAULT_FILE_PATH,)
+    path = os.path.join(tmp_dir, f"synthetic_trips_{n}.csv")
+    if not os.path.exists(path):
+        synthetic_trips(n).to_csv(path, index=False)
+    return (path,)
+
+def _run_csv(path):
+    pair_counts = load_trip_pair_counts(path)
+    return {'pairs': len(pair_counts), 'trips': int(pair_counts['COUNT'].sum())}
+
+def _setup_edges(n, tmp_dir):
+    trips = synthetic_trips(n)
+    return trips, _station_labels(trips)
+
+def _run_edges(trips, labels):
+    edges = generate_station_trip_edges(trips, labels)
+    return {'edges': len(edges), 'weight': int(sum(w for _, _, w in edges))}
+
+def _setup_expand(n, tmp_dir):
+    trips = synthetic_trips(n)
+    edge_index = build_trip_edge_index(generate_station_trip_edges(trips, _station_labels(trips)))
+    return nx.Graph(), edge_index, n
+
+def _run_expand(G, edge_index, n):
+    random.seed(SEED)
+    expand_small_world_graph(G, edge_index, n, 4, 0.1)
+    return {'nodes': len(G), 'edges': G.number_of_edges()}
+
+def _setup_graph(n, tmp_dir):
+    return (_ws_graph(n),)
+
+def _run_girvan_newman(G):
+    return {'clusters': len(girvan_newman_communities(G))}
+
+# Same metrics as networkGraph.calculate_network_metrics, without the plot
+def _run_network_metrics(G):
+    return {'avg_path_length': round(average_path_length(G, seed=SEED), 6),
+            'avg_clustering': round(nx.average_clustering(G), 6)}
+
+def _run_betweenness(G):
+    betweenness = betweenness_centrality(G, epsilon=0.05, seed=SEED)
+    top = max(betweenness, key=betweenness.get)
+    return {'top_node': top, 'top_value': round(betweenness[top], 6)}
+
+CASES = {
+    'csv_ingestion': (_setup_csv, _run_csv, 100_000),
+    'generate_station_trip_edges': (_setup_edges, _run_edges, 100_000),
+    'expand_small_world_graph': (_setup_expand, _run_expand, 100_000),
+    'girvan_newman_clusters': (_setup_graph, _run_girvan_newman, 1_000),
+    'calculate_network_metrics': (_setup_graph, _run_network_metrics, 100_000),
+    'betweenness': (_setup_graph, _run_betweenness, 10_000),
+}
+
+# Function to time one case at one size: best of up to MAX_REPEATS runs within the repeat budget
+def run_case(name, n, tmp_dir):
+    setup, run, _ = CASES[name]
+    timings = []
+    result = None
+    while len(timings) < MAX_REPEATS and (not timings or sum(timings) < REPEAT_BUDGET_SECONDS):
+        inputs = setup(n, tmp_dir)
+        start = time.perf_counter()
+        result = run(*inputs)
+        timings.append(time.perf_counter() - start)
+    return {'case': name, 'size': 'bundled' if n is None else n, 'seconds': min(timings),
+            'repeats': len(timings), 'result': result}
+
+def _key(record):
+    return f"{record['case']}@{record['size']}"
+
+# Function to compare results with the baseline; returns (rows, failed)
+# Only changed results fail the run, and slower cases too when fail_on_slower is set.
+def compare_with_baseline(records, baseline, fail_on_slower=False):
+    rows, failed = [], False
+    for record in records:
+        reference = baseline.get(_key(record))
+        status, ratio = 'new', None
+        if reference is not None:
+            ratio = record['seconds'] / reference['seconds'] if reference['seconds'] > 0 else None
+            if json.loads(json.dumps(record['result'])) != reference['result']:
+                status = 'RESULT CHANGED'
+            elif ratio is not None and ratio > REGRESSION_RATIO:
+                status = 'SLOWER'
+            else:
+                status = 'ok'
+            failed |= status == 'RESULT CHANGED' or (status == 'SLOWER' and fail_on_slower)
+        rows.append((record, reference, ratio, status))
+    return rows, failed
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark loaders, generators and metrics against a stored baseline")
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES, help="node counts to run")
+    parser.add_argument('--cases', nargs='+', default=list(CASES), choices=list(CASES), help="cases to run")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="baseline JSON to compare with or save to")
+    parser.add_argument('--save-baseline', action='store_true', help="store these results as the new baseline")
+    parser.add_argument('--fail-on-slower', action='store_true',
+                        help=f"exit with status 1 when a case is more than {REGRESSION_RATIO}x slower than its baseline "
+                             "(only meaningful with a baseline saved on this machine)")
+    return parser.parse_args(argv)
+
+if __name__ == '__main__':
+    args = _parse_args()
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    records = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name in args.cases:
+            # CSV ingestion also runs on the bundled 17k-trip sample
+            sizes = ([None] if name == 'csv_ingestion' else []) + [n for n in args.sizes if n <= CASES[name][2]]
+            for n in sizes:
+                record = run_case(name, n, tmp_dir)
+                records.append(record)
+                print(f"{record['case']:<28} {str(record['size']):>8}  {record['seconds']:9.4f}s  {record['result']}", flush=True)
+
+    if args.save_baseline:
+        baseline.update({_key(record): {k: record[k] for k in ('seconds', 'result')} for record in records})
+        with open(args.baseline, 'w') as f:
+            json.dump(dict(sorted(baseline.items())), f, indent=1)
+        print(f"Saved {len(records)} results to {args.baseline}")
+        sys.exit(0)
+
+    rows, failed = compare_with_baseline(records, baseline, args.fail_on_slower)
+    print(f"\n{'case':<28} {'size':>8} {'seconds':>10} {'baseline':>10} {'ratio':>7}  status")
+    for record, reference, ratio, status in rows:
+        reference_seconds = f"{reference['seconds']:10.4f}" if reference else f"{'-':>10}"
+        ratio_text = f"{ratio:7.2f}" if ratio is not None else f"{'-':>7}"
+        print(f"{record['case']:<28} {str(record['size']):>8} {record['seconds']:10.4f} {reference_seconds} {ratio_text}  {status}")
+    slower = sum(status == 'SLOWER' for _, _, _, status in rows)
+    if slower and not args.fail_on_slower:
+        print(f"\nWarning: {slower} case(s) more than {REGRESSION_RATIO}x slower than the baseline; timings depend on "
+              "the machine, so this does not fail the run (pass --fail-on-slower to make it)")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,57 @@
+# Divvy station network analysis: Watts-Strogatz growth, community detection and trip graph metrics
+# Importing the package does no work: each name below is imported from its submodule on first
+# access, so `import divvy_network` (and every worker process that unpickles a task from it)
+# does not pay for pandas, networkx or matplotlib until they are actually used.
+import importlib
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    'watts_strogatz_graph': 'watts_strogatz',
+    'girvan_newman_communities': 'communities',
+    'detect_communities': 'communities',
+    'compare_community_methods': 'communities',
+    'COMMUNITY_METHODS': 'communities',
+    'betweenness_centrality': 'centrality',
+    'average_path_length': 'path_length',
+    'cluster_metrics': 'cluster_analysis',
+    'CSRGraph': 'csr_graph',
+    'IncrementalGraphMetrics': 'incremental_metrics',
+    'DEFAULT_FILE_PATH': 'divvy_loader',
+    'load_divvy_trips': 'divvy_loader',
+    'load_trip_pair_counts': 'divvy_loader',
+    'load_trip_pair_stats': 'divvy_loader',
+    'load_station_coordinates': 'divvy_loader',
+    'iter_trips_by_start_time': 'divvy_loader',
+    'load_cached_trip_tables': 'trip_cache',
+    'generate_station_trip_edges': 'trip_graph',
+    'build_trip_edge_index': 'trip_graph',
+    'expand_small_world_graph': 'trip_graph',
+    'build_trip_digraph': 'weighted_graph',
+    'weighted_network_metrics': 'weighted_graph',
+    'StationIndex': 'spatial',
+    'WindowedTripGraph': 'trip_windows',
+    'stream_trip_windows': 'trip_windows',
+    'stream_divvy_windows': 'trip_windows',
+    'sweep_configs': 'sweep',
+    'run_sweep': 'sweep',
+    'configure_rendering': 'rendering',
+    'configure_profiling': 'profiling',
+    'profile_stage': 'profiling',
+    'run_small_world': 'small_world',
+    'run_simulation': 'simulation',
+    'run_dataset': 'dataset',
+}
+
+__all__ = sorted(_EXPORTS)
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module_name}', __name__), name)
+    # Cache it so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,6 @@
+# python -m divvy_network <command> [options]
+import sys
+
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,107 @@
+import math
+import random
+
+import networkx as nx
+
+# Graphs up to this many nodes use exact Brandes betweenness when approximate=None
+EXACT_BETWEENNESS_MAX_NODES = 1000
+
+# Function to bound the vertex diameter (most nodes on any shortest path) with one BFS per component
+# The eccentricity of any node is at least half the diameter, so 2 * ecc + 1 is an upper bound.
+def estimate_vertex_diameter(G, seed=None):
+    rng = random.Random(seed)
+    vertex_diameter = 1
+    for component in nx.connected_components(G):
+        source = rng.choice(list(component))
+        ecc = max(nx.single_source_shortest_path_length(G, source).values())
+        vertex_diameter = max(vertex_diameter, min(len(component), 2 * ecc + 1))
+    return vertex_diameter
+
+# Function to compute the Riondato-Kornaropoulos sample size for an (epsilon, delta) guarantee
+def betweenness_sample_size(vertex_diameter, epsilon, delta, c=0.5):
+    vc_bound = math.floor(math.log2(max(vertex_diameter - 2, 1))) + 1
+    return math.ceil((c / epsilon ** 2) * (vc_bound + math.log(1 / delta)))
+
+# Function to pick one shortest s-t path uniformly at random and return its interior nodes
+def _sample_shortest_path_interior(G, s, t, rng):
+    dist = {s: 0}
+    sigma = {s: 1}
+    preds = {s: []}
+    frontier = [s]
+    # BFS level by level, stopping once t's level is complete so sigma[t] is final
+    while frontier and t not in dist:
+        next_frontier = []
+        for u in frontier:
+            for w in G[u]:
+                if w not in dist:
+                    dist[w] = dist[u] + 1
+                    sigma[w] = 0
+                    preds[w] = []
+                    next_frontier.append(w)
+                if dist[w] == dist[u] + 1:
+                    sigma[w] += sigma[u]
+                    preds[w].append(u)
+        frontier = next_frontier
+
+    if t not in dist:
+        return []
+
+    # Walk back from t, choosing each predecessor in proportion to its path count
+    interior = []
+    node = t
+    while True:
+        x = rng.random() * sigma[node]
+        for p in preds[node]:
+            x -= sigma[p]
+            if x < 0:
+                break
+        if p == s:
+            return interior
+        interior.append(p)
+        node = p
+
+# Function to estimate betweenness centrality by sampling shortest paths (Riondato-Kornaropoulos)
+# With probability at least 1 - delta every node's estimate is within epsilon of its exact
+# betweenness (normalized as in nx.betweenness_centrality). Falls back to exact Brandes when the
+# sample would need more BFS runs than the exact algorithm.
+def approximate_betweenness_centrality(G, epsilon=0.01, delta=0.1, seed=None):
+    n = len(G)
+    if n <= 2:
+        return dict.fromkeys(G, 0.0)
+
+    rng = random.Random(seed)
+    num_samples = betweenness_sample_size(estimate_vertex_diameter(G, seed=rng.random()), epsilon, delta)
+    if num_samples >= n:
+        return nx.betweenness_centrality(G)
+
+    nodes = list(G)
+    betweenness = dict.fromkeys(G, 0.0)
+    for _ in range(num_samples):
+        s, t = rng.sample(nodes, 2)
+        for node in _sample_shortest_path_interior(G, s, t, rng):
+            betweenness[node] += 1
+
+    # Samples estimate sigma_st(v)/sigma_st over ordered pairs, i.e. divided by n(n-1);
+    # networkx normalizes undirected betweenness by (n-1)(n-2)
+    scale = n / ((n - 2) * num_samples)
+    return {node: value * scale for node, value in betweenness.items()}
+
+# Function to compute betweenness centrality exactly for small graphs and by sampling for large ones
+# approximate=None decides by node count; True/False force one mode. In approximate mode, k
+# selects k-pivot (Brandes-Pich) sampling instead of the epsilon/delta path sampling.
+def betweenness_centrality(G, approximate=None, epsilon=0.01, delta=0.1, k=None, seed=None):
+    if approximate is None:
+        approximate = len(G) > EXACT_BETWEENNESS_MAX_NODES
+    if not approximate:
+        return nx.betweenness_centrality(G)
+    if k is not None:
+        return nx.betweenness_centrality(G, k=min(k, len(G)), seed=seed)
+    return approximate_betweenness_centrality(G, epsilon=epsilon, delta=delta, seed=seed)
+
+# Function to return the node with the highest betweenness centrality and its value
+# Convenience only: it computes the same full (or sampled) betweenness as betweenness_centrality
+# and takes the max, so it costs exactly as much.
+def highest_betweenness_node(G, approximate=None, epsilon=0.01, delta=0.1, k=None, seed=None):
+    node_betweenness_centrality = betweenness_centrality(G, approximate, epsilon, delta, k, seed)
+    max_node = max(node_betweenness_centrality, key=node_betweenness_centrality.get)
+    return max_node, node_betweenness_centrality[max_node]
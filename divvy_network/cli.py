@@ -0,0 +1,51 @@
+import argparse
+import importlib
+import os
+import sys
+
+from . import profiling, rendering
+from .profiling import configure_profiling
+from .rendering import configure_rendering, RENDER_MODES
+
+# Subcommand -> module with a main(argv) function; the module (and its pandas / networkx
+# imports) is only loaded once its command is chosen, so `--help` returns immediately
+COMMANDS = {
+    'small-world': ('small_world', "grow a small-world station graph from trip data and analyze its clusters"),
+    'simulate': ('simulation', "grow Watts-Strogatz graphs and analyze their Girvan-Newman clusters"),
+    'dataset': ('dataset', "Watts-Strogatz metrics over the stations of a trip CSV"),
+    'sweep': ('sweep', "parallel (n, k, p) parameter sweep"),
+    'windows': ('trip_windows', "per-window station graph summaries from a trip CSV"),
+}
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='divvy_network', allow_abbrev=False,
+        description="Divvy station network analysis",
+        epilog="commands:\n" + "\n".join(f"  {name:<12} {help_text}" for name, (_, help_text) in COMMANDS.items())
+               + "\n\nRun 'python -m divvy_network <command> --help' for a command's options.",
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--render', choices=RENDER_MODES, default=None, help="show, save or skip figures (default: DIVVY_RENDER or 'show')")
+    parser.add_argument('--plot-dir', default=None, help="where --render save writes PNGs (default: DIVVY_PLOT_DIR or 'plots')")
+    parser.add_argument('--profile', default=None, help="comma-separated profiling options: time, memory, cprofile (default: DIVVY_PROFILE)")
+    parser.add_argument('--profile-dir', default=None, help="where profiling reports are written (default: DIVVY_PROFILE_DIR or 'profiles')")
+    parser.add_argument('command', choices=list(COMMANDS), metavar='command', help="one of: " + ", ".join(COMMANDS))
+    parser.add_argument('args', nargs=argparse.REMAINDER, help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+# Function to apply the global options and run one subcommand
+# Example: python -m divvy_network --render save --profile time small-world --iterations 3
+def main(argv=None):
+    args = _parse_args(argv)
+    # Flags override the environment variables; an unset flag keeps the environment's value
+    if args.render is not None or args.plot_dir is not None:
+        configure_rendering(args.render or rendering.current_render_mode(), args.plot_dir)
+    if args.profile is not None or args.profile_dir is not None:
+        configure_profiling(args.profile if args.profile is not None else os.environ.get('DIVVY_PROFILE'), args.profile_dir)
+    # Name saved figures and profiling reports after the command rather than __main__
+    rendering.figure_prefix = profiling.report_prefix = args.command.replace('-', '_')
+    module_name, _ = COMMANDS[args.command]
+    command = importlib.import_module(f'.{module_name}', __package__)
+    return command.main(args.args)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,79 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import networkx as nx
+import numpy as np
+
+from .centrality import betweenness_centrality
+
+# Function to split G into one compact (nodes, edges) array pair per cluster
+# Arrays pickle far smaller and faster than NetworkX subgraphs when sent to worker processes.
+def cluster_edge_arrays(G, clusters):
+    cluster_of = {}
+    for idx, cluster in enumerate(clusters):
+        for node in cluster:
+            cluster_of[node] = idx
+
+    cluster_edges = [[] for _ in clusters]
+    for u, v in G.edges():
+        idx = cluster_of.get(u)
+        if idx is not None and idx == cluster_of.get(v):
+            cluster_edges[idx].append((u, v))
+
+    # Keep each cluster's node order from G, as G.subgraph(cluster) would iterate it
+    cluster_nodes = [[] for _ in clusters]
+    for node in G:
+        idx = cluster_of.get(node)
+        if idx is not None:
+            cluster_nodes[idx].append(node)
+
+    return [(np.asarray(nodes), np.asarray(edges).reshape(-1, 2))
+            for nodes, edges in zip(cluster_nodes, cluster_edges)]
+
+# Function to decide whether a cluster needs betweenness, given (min_density, max_density, min_size)
+# Bounds are strict like the scripts' thresholds; None leaves that side unbounded.
+def _needs_betweenness(betweenness_when, density, size):
+    if betweenness_when is None:
+        return False
+    min_density, max_density, min_size = betweenness_when
+    return ((min_density is None or density > min_density)
+            and (max_density is None or density < max_density)
+            and size >= min_size)
+
+# Function to compute one cluster's metrics from its compact arrays; runs in a worker process
+def _cluster_metrics_from_arrays(args):
+    nodes, edges, betweenness_when, top_only, epsilon, seed = args
+    H = nx.Graph()
+    H.add_nodes_from(nodes.tolist())
+    H.add_edges_from(edges.tolist())
+
+    density = nx.density(H)
+    metrics = {'size': len(nodes), 'num_edges': H.number_of_edges(), 'density': density,
+               'betweenness': None, 'max_node': None, 'max_value': None}
+
+    if _needs_betweenness(betweenness_when, density, len(nodes)):
+        node_betweenness_centrality = betweenness_centrality(H, epsilon=epsilon, seed=seed)
+        max_node = max(node_betweenness_centrality, key=node_betweenness_centrality.get)
+        metrics['max_node'] = max_node
+        metrics['max_value'] = node_betweenness_centrality[max_node]
+        if not top_only:
+            metrics['betweenness'] = node_betweenness_centrality
+    return metrics
+
+# Function to compute density, edge count and (where betweenness_when matches) betweenness per cluster
+# workers=1 runs in-process; any other value (None = all cores) uses a process pool. Both paths
+# run the same per-cluster code on the same arrays, so their results are identical.
+# top_only drops the per-node betweenness dicts from the results (less to send back from workers);
+# betweenness is still computed for every node of the matching clusters.
+def cluster_metrics(G, clusters, betweenness_when=None, top_only=True, epsilon=0.05, seed=None, workers=1):
+    tasks = [(nodes, edges, betweenness_when, top_only, epsilon, seed)
+             for nodes, edges in cluster_edge_arrays(G, clusters)]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) <= 1:
+        return [_cluster_metrics_from_arrays(task) for task in tasks]
+
+    # Many tiny clusters are batched so per-task IPC does not dominate
+    chunksize = max(1, len(tasks) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_cluster_metrics_from_arrays, tasks, chunksize=chunksize))
@@ -0,0 +1,162 @@
+import time
+
+import networkx as nx
+
+# Function to compute raw (unnormalized) edge betweenness inside one connected component
+# Raw values are comparable across components because no shortest path crosses a
+# component boundary, so the global most-central edge is the max of per-component maxima.
+def _component_edge_betweenness(H, component):
+    if len(component) < 2:
+        return {}, None
+    # Copying the subgraph is O(m) and much faster to traverse than a filtered view
+    subgraph = H if len(component) == len(H) else H.subgraph(component).copy()
+    betweenness = nx.edge_betweenness_centrality(subgraph, normalized=False)
+    if not betweenness:
+        return betweenness, None
+    return betweenness, max(betweenness, key=betweenness.get)
+
+# Function to run Girvan-Newman, recomputing betweenness only in the component that lost an edge
+# Yields the partition (a tuple of node sets, ordered by each set's smallest node) every time
+# the number of components grows, like nx.community.girvan_newman.
+def girvan_newman_partitions(G):
+    H = G.copy()
+    H.remove_edges_from(nx.selfloop_edges(H))
+
+    components = [set(c) for c in nx.connected_components(H)]
+    betweenness = [_component_edge_betweenness(H, c) for c in components]
+
+    while H.number_of_edges() > 0:
+        # Pick the component holding the globally most central edge
+        idx = max(
+            (i for i, (_, edge) in enumerate(betweenness) if edge is not None),
+            key=lambda i: betweenness[i][0][betweenness[i][1]],
+        )
+        u, v = betweenness[idx][1]
+        H.remove_edge(u, v)
+
+        component = components[idx]
+        part_u = nx.node_connected_component(H, u)
+        if len(part_u) == len(component):
+            # Still connected: only this component's betweenness changes
+            betweenness[idx] = _component_edge_betweenness(H, component)
+            continue
+
+        part_v = component - part_u
+        components[idx] = part_u
+        betweenness[idx] = _component_edge_betweenness(H, part_u)
+        components.append(part_v)
+        betweenness.append(_component_edge_betweenness(H, part_v))
+        # Ordered by smallest node so the tuple does not depend on which edge endpoint split off
+        yield tuple(sorted(components, key=min))
+
+# Function to detect communities with the incremental Girvan-Newman engine
+# By default returns the first split, as the scripts' girvan_newman_clusters always did.
+# num_communities stops at the first partition with at least that many communities (and bounds
+# the scan below); stop_at_modularity_peak returns the highest-modularity partition of the split sequence. The
+# curve can dip before it peaks, so the whole sequence is scanned unless patience is set, in
+# which case it stops after that many splits without a new best.
+def girvan_newman_communities(G, num_communities=None, stop_at_modularity_peak=False, patience=None):
+    if G.number_of_edges() == 0:
+        return [list(G.nodes())]
+
+    best_partition, best_modularity = None, None
+    splits_since_best = 0
+    for partition in girvan_newman_partitions(G):
+        if stop_at_modularity_peak:
+            modularity = nx.community.modularity(G, partition)
+            if best_modularity is None or modularity > best_modularity:
+                best_partition, best_modularity = partition, modularity
+                splits_since_best = 0
+            else:
+                splits_since_best += 1
+                if patience is not None and splits_since_best >= patience:
+                    break
+        else:
+            best_partition = partition
+            if num_communities is None:
+                break
+        if num_communities is not None and len(partition) >= num_communities:
+            break
+
+    if best_partition is None:
+        # Only self-loops: nothing to split
+        best_partition = tuple(nx.connected_components(G))
+    return tuple(sorted(c) for c in best_partition)
+
+# Result of detect_communities: iterates like the cluster tuple analyze_clusters expects,
+# and also carries the method name, modularity and runtime of the run
+class CommunityResult(tuple):
+    def __new__(cls, clusters, method, modularity, runtime):
+        result = super().__new__(cls, clusters)
+        result.method = method
+        result.modularity = modularity
+        result.runtime = runtime
+        return result
+
+def _louvain(G, seed=None, **kwargs):
+    return nx.community.louvain_communities(G, seed=seed, **kwargs)
+
+def _label_propagation(G, seed=None, **kwargs):
+    # The asynchronous variant is seedable; the semi-synchronous one is deterministic
+    if seed is None:
+        return nx.community.label_propagation_communities(G)
+    return nx.community.asyn_lpa_communities(G, seed=seed, **kwargs)
+
+def _leiden(G, seed=None, **kwargs):
+    try:
+        import igraph as ig
+        import leidenalg
+    except ImportError:
+        try:
+            # Only available when a networkx backend (e.g. nx-cugraph) implements it
+            return nx.community.leiden_communities(G, seed=seed, **kwargs)
+        except NotImplementedError:
+            raise ImportError("Leiden needs the optional 'leidenalg' and 'igraph' packages "
+                              "or a networkx backend that implements leiden_communities") from None
+
+    nodes = list(G.nodes())
+    index = {node: i for i, node in enumerate(nodes)}
+    ig_graph = ig.Graph(n=len(nodes), edges=[(index[u], index[v]) for u, v in G.edges()])
+    partition = leidenalg.find_partition(ig_graph, leidenalg.ModularityVertexPartition, seed=seed, **kwargs)
+    return [{nodes[i] for i in community} for community in partition]
+
+def _girvan_newman(G, seed=None, **kwargs):
+    return girvan_newman_communities(G, **kwargs)
+
+COMMUNITY_METHODS = {
+    'girvan_newman': _girvan_newman,
+    'louvain': _louvain,
+    'label_propagation': _label_propagation,
+    'leiden': _leiden,
+}
+
+# Function to detect communities with any of COMMUNITY_METHODS behind one interface
+# Extra keyword arguments go to the underlying algorithm (e.g. num_communities for Girvan-Newman).
+def detect_communities(G, method='louvain', seed=None, **kwargs):
+    if method not in COMMUNITY_METHODS:
+        raise ValueError(f"Unknown community detection method {method!r}; choose from {sorted(COMMUNITY_METHODS)}")
+
+    start = time.perf_counter()
+    if G.number_of_edges() == 0:
+        communities = [list(G.nodes())]
+    else:
+        communities = COMMUNITY_METHODS[method](G, seed=seed, **kwargs)
+    clusters = sorted((sorted(c) for c in communities), key=lambda c: (-len(c), c))
+    runtime = time.perf_counter() - start
+
+    modularity = nx.community.modularity(G, clusters) if G.number_of_edges() > 0 else 0.0
+    return CommunityResult(clusters, method, modularity, runtime)
+
+# Function to run several methods on the same graph and report modularity and runtime for each
+def compare_community_methods(G, methods=('girvan_newman', 'label_propagation', 'louvain', 'leiden'), seed=None):
+    report = []
+    for method in methods:
+        try:
+            result = detect_communities(G, method=method, seed=seed)
+        except ImportError as e:
+            print(f"{method}: skipped ({e})")
+            continue
+        print(f"{method}: {len(result)} communities, modularity {result.modularity:.4f}, {result.runtime:.3f}s")
+        report.append({'method': method, 'communities': len(result),
+                       'modularity': result.modularity, 'runtime': result.runtime})
+    return report
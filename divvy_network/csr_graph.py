@@ -0,0 +1,192 @@
+import numpy as np
+
+# Compact undirected graph stored as CSR arrays (indptr/indices int32, weights float32)
+# Every edge is stored once per direction, neighbor lists are sorted, and nodes are the
+# positions 0..n-1; `nodes` maps positions back to the original labels.
+class CSRGraph:
+    def __init__(self, indptr, indices, weights, nodes=None):
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.num_nodes = len(indptr) - 1
+        self.nodes = np.arange(self.num_nodes) if nodes is None else np.asarray(nodes)
+
+    # Function to build a CSR graph straight from (src, dst, weight) edge arrays
+    # Both directions of a pair are one undirected edge; weights of duplicates are summed,
+    # so (a, b) and (b, a) trip counts add up to the total trips between two stations.
+    @classmethod
+    def from_edge_arrays(cls, src, dst, weight=None, num_nodes=None, nodes=None):
+        src = np.asarray(src, dtype=np.int64)
+        dst = np.asarray(dst, dtype=np.int64)
+        weight = np.ones(len(src), dtype=np.float32) if weight is None else np.asarray(weight, dtype=np.float32)
+        if num_nodes is None:
+            num_nodes = len(nodes) if nodes is not None else int(max(src.max(initial=-1), dst.max(initial=-1))) + 1
+
+        low, high = np.minimum(src, dst), np.maximum(src, dst)
+        keys, inverse = np.unique(low * num_nodes + high, return_inverse=True)
+        summed = np.bincount(inverse, weights=weight, minlength=len(keys)).astype(np.float32)
+        low, high = keys // num_nodes, keys % num_nodes
+
+        # Store both directions, except for self-loops which appear once
+        loops = low == high
+        rows = np.concatenate([low, high[~loops]])
+        cols = np.concatenate([high, low[~loops]])
+        vals = np.concatenate([summed, summed[~loops]])
+
+        order = np.lexsort((cols, rows))
+        indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=num_nodes), out=indptr[1:])
+        return cls(indptr.astype(np.int32), cols[order].astype(np.int32), vals[order], nodes)
+
+    @classmethod
+    def from_networkx(cls, G, weight='weight'):
+        nodes = list(G)
+        index = {node: i for i, node in enumerate(nodes)}
+        num_edges = G.number_of_edges()
+        src = np.fromiter((index[u] for u, _ in G.edges()), dtype=np.int64, count=num_edges)
+        dst = np.fromiter((index[v] for _, v in G.edges()), dtype=np.int64, count=num_edges)
+        weights = np.fromiter((w for _, _, w in G.edges(data=weight, default=1)), dtype=np.float32, count=num_edges)
+        return cls.from_edge_arrays(src, dst, weights, num_nodes=len(nodes), nodes=nodes)
+
+    # Function to convert back to NetworkX for algorithms not implemented here
+    def to_networkx(self, weight='weight'):
+        # Imported here so array-only users (and worker processes) never load networkx
+        import networkx as nx
+        G = nx.Graph()
+        G.add_nodes_from(self.nodes.tolist())
+        rows = np.repeat(np.arange(self.num_nodes), np.diff(self.indptr))
+        keep = rows <= self.indices
+        labels = self.nodes
+        G.add_weighted_edges_from(
+            zip(labels[rows[keep]].tolist(), labels[self.indices[keep]].tolist(), self.weights[keep].tolist()),
+            weight=weight,
+        )
+        return G
+
+    def _self_loops(self):
+        rows = np.repeat(np.arange(self.num_nodes), np.diff(self.indptr))
+        return np.bincount(rows[rows == self.indices], minlength=self.num_nodes)
+
+    def number_of_edges(self):
+        loops = int(self._self_loops().sum())
+        return (len(self.indices) - loops) // 2 + loops
+
+    # Function to return degrees as networkx counts them (a self-loop adds 2)
+    def degrees(self):
+        return np.diff(self.indptr) + self._self_loops()
+
+    def density(self):
+        n = self.num_nodes
+        if n <= 1:
+            return 0.0
+        return 2 * self.number_of_edges() / (n * (n - 1))
+
+    # Function to gather the neighbors of every node in `frontier` in one vectorized step
+    def _neighbors_of(self, frontier):
+        starts = self.indptr[frontier].astype(np.int64)
+        counts = self.indptr[frontier + 1] - starts
+        offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+        return self.indices[offsets + np.arange(counts.sum())]
+
+    # Function to return BFS hop distances from source (-1 where unreachable)
+    def bfs_distances(self, source):
+        dist = np.full(self.num_nodes, -1, dtype=np.int32)
+        dist[source] = 0
+        frontier = np.array([source], dtype=np.int64)
+        level = 0
+        while frontier.size:
+            level += 1
+            neighbors = self._neighbors_of(frontier)
+            neighbors = np.unique(neighbors[dist[neighbors] < 0])
+            dist[neighbors] = level
+            frontier = neighbors
+        return dist
+
+    # Function to label connected components by min-label propagation with pointer jumping
+    def connected_component_labels(self):
+        labels = np.arange(self.num_nodes)
+        counts = np.diff(self.indptr)
+        has_neighbors = counts > 0
+        starts = self.indptr[:-1][has_neighbors]
+        while True:
+            neighbor_min = np.minimum.reduceat(labels[self.indices], starts) if len(starts) else starts
+            new_labels = labels.copy()
+            new_labels[has_neighbors] = np.minimum(labels[has_neighbors], neighbor_min)
+            # Propagate through the label forest so long paths collapse in few rounds
+            np.minimum.at(new_labels, labels, new_labels)
+            new_labels = new_labels[new_labels]
+            if np.array_equal(new_labels, labels):
+                return labels
+            labels = new_labels
+
+    def largest_component(self):
+        labels = self.connected_component_labels()
+        return np.flatnonzero(labels == np.bincount(labels).argmax())
+
+    # Function to return the subgraph induced by the given node positions
+    def subgraph(self, node_positions):
+        node_positions = np.asarray(node_positions)
+        position = np.full(self.num_nodes, -1, dtype=np.int64)
+        position[node_positions] = np.arange(len(node_positions))
+        rows = np.repeat(np.arange(self.num_nodes), np.diff(self.indptr))
+        keep = (position[rows] >= 0) & (position[self.indices] >= 0) & (rows <= self.indices)
+        return CSRGraph.from_edge_arrays(position[rows[keep]], position[self.indices[keep]], self.weights[keep],
+                                         num_nodes=len(node_positions), nodes=self.nodes[node_positions])
+
+    # Function to count triangles per node with degree-ordered wedge enumeration
+    # Each edge is oriented from lower to higher (degree, id) rank, so every triangle is found
+    # exactly once from its lowest-ranked node and out-degrees stay O(sqrt(m)).
+    def triangles(self):
+        n = self.num_nodes
+        rows = np.repeat(np.arange(n), np.diff(self.indptr))
+        cols = self.indices.astype(np.int64)
+        degree = np.diff(self.indptr)
+        rank = np.empty(n, dtype=np.int64)
+        rank[np.lexsort((np.arange(n), degree))] = np.arange(n)
+
+        forward = rank[rows] < rank[cols]
+        out_src, out_dst = rows[forward], cols[forward]
+        order = np.lexsort((out_dst, out_src))
+        out_src, out_dst = out_src[order], out_dst[order]
+
+        # For each oriented edge (u, v) at position p in u's out-list, pair it with positions q > p
+        out_degree = np.bincount(out_src, minlength=n)
+        out_start = np.concatenate([[0], np.cumsum(out_degree)[:-1]])
+        position = np.arange(len(out_src)) - out_start[out_src]
+        pairs_per_edge = out_degree[out_src] - 1 - position
+        first = np.repeat(np.arange(len(out_src)), pairs_per_edge)
+        second = first + 1 + (np.arange(len(first)) - np.repeat(np.cumsum(pairs_per_edge) - pairs_per_edge, pairs_per_edge))
+
+        u, v, w = out_src[first], out_dst[first], out_dst[second]
+        edge_keys = np.sort(np.minimum(out_src, out_dst) * n + np.maximum(out_src, out_dst))
+        wedge_keys = np.minimum(v, w) * n + np.maximum(v, w)
+        hits = np.searchsorted(edge_keys, wedge_keys)
+        closed = (hits < len(edge_keys)) & (edge_keys[np.minimum(hits, len(edge_keys) - 1)] == wedge_keys)
+
+        return (np.bincount(u[closed], minlength=n) + np.bincount(v[closed], minlength=n)
+                + np.bincount(w[closed], minlength=n))
+
+    # Function to compute local clustering coefficients (self-loops ignored, as in nx.clustering)
+    def clustering(self):
+        degree = (np.diff(self.indptr) - self._self_loops()).astype(np.float64)
+        possible = degree * (degree - 1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(possible > 0, 2 * self.triangles() / possible, 0.0)
+
+    def average_clustering(self):
+        return float(self.clustering().mean()) if self.num_nodes else 0.0
+
+    # Function to compute the average shortest path length of the largest component
+    # Exact (BFS from every node) when num_sources is None or covers the component,
+    # otherwise averaged over num_sources randomly sampled BFS sources.
+    def average_shortest_path_length(self, num_sources=None, seed=None):
+        component = self.largest_component()
+        graph = self if len(component) == self.num_nodes else self.subgraph(component)
+        n = graph.num_nodes
+        if n < 2:
+            return 0.0
+        sources = np.arange(n)
+        if num_sources is not None and num_sources < n:
+            sources = np.random.default_rng(seed).choice(n, size=num_sources, replace=False)
+        total = sum(int(graph.bfs_distances(s).sum()) for s in sources)
+        return total / (len(sources) * (n - 1))
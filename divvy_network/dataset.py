@@ -0,0 +1,106 @@
+import argparse
+
+from .divvy_loader import load_divvy_trips, DEFAULT_FILE_PATH, STATION_NAME_COLUMNS
+from .rendering import pyplot, finish_figure, render_view, rendering_enabled, LABEL_MAX_NODES
+
+# networkx, pandas and the graph modules are imported inside the functions that use them, as in
+# small_world.py, so importing this module (or divvyDataset.py) stays cheap
+
+# Degree Distribution
+def plot_degree_distribution(G):
+    if not rendering_enabled():
+        return
+    plt = pyplot()
+    degrees = [G.degree(n) for n in G.nodes()]  # Get degrees for all nodes
+    fig, ax = plt.subplots(figsize=(7, 7))  # Adjusted for a single histogram
+    ax.hist(degrees, bins=range(max(degrees)+1), color='blue', alpha=0.7, rwidth=0.85)
+    ax.set_title('Degree Distribution')
+    ax.set_xlabel('Degree')
+    ax.set_ylabel('Frequency')
+    plt.tight_layout()
+    finish_figure('degree_distribution')
+
+def calculate_average_path_length(G, exact_max_nodes=None, num_sources=256, workers=1):
+    from .path_length import average_path_length, EXACT_PATH_LENGTH_MAX_NODES
+    # Uses the largest connected component if the graph is disconnected; above exact_max_nodes
+    # (default EXACT_PATH_LENGTH_MAX_NODES) nodes the average is estimated from BFS runs on
+    # num_sources sampled sources
+    if exact_max_nodes is None:
+        exact_max_nodes = EXACT_PATH_LENGTH_MAX_NODES
+    return average_path_length(G, exact_max_nodes, num_sources, workers=workers)
+    
+def calculate_clustering_coefficients(G):
+    from .csr_graph import CSRGraph
+    # Calculate the clustering coefficient for each node on the array-backed CSR copy of G
+    csr = CSRGraph.from_networkx(G)
+    clustering = csr.clustering()
+    node_clustering = dict(zip(csr.nodes.tolist(), clustering.tolist()))
+    
+    # Calculate the average clustering coefficient for the whole graph
+    average_clustering = float(clustering.mean())
+
+    return node_clustering, average_clustering
+
+def calculate_betweenness_centrality(G, approximate=None, epsilon=0.05, delta=0.1):
+    from .centrality import betweenness_centrality
+    # Calculate betweenness centrality for each node; above EXACT_BETWEENNESS_MAX_NODES nodes
+    # it is estimated to within epsilon with probability 1 - delta
+    node_betweenness_centrality = betweenness_centrality(G, approximate, epsilon, delta)
+    # Calculate the average betweenness centrality
+    average_betweenness_centrality = sum(node_betweenness_centrality.values()) / len(node_betweenness_centrality)
+    return node_betweenness_centrality, average_betweenness_centrality
+
+# Function to build a Watts-Strogatz graph over the CSV's stations and report its metrics
+# k is the number of nearest neighbors, p is the probability of rewiring each edge
+def run_dataset(file_path=DEFAULT_FILE_PATH, max_stations=15000, k=3, p=0.5):
+    import networkx as nx
+    import pandas as pd
+    from .watts_strogatz import watts_strogatz_graph
+    # Load the station name columns from the CSV file
+    divvy_data = load_divvy_trips(file_path, STATION_NAME_COLUMNS)
+
+    # Select the first max_stations unique stations from both "FROM STATION NAME" and "TO STATION NAME"
+    unique_stations = pd.unique(divvy_data[['FROM STATION NAME', 'TO STATION NAME']].values.ravel('K'))
+    selected_stations = unique_stations[:max_stations]
+
+    # Create the Watts-Strogatz model
+    ws_graph = watts_strogatz_graph(n=len(selected_stations), k=k, p=p)
+    labels = {i: station for i, station in enumerate(selected_stations)}  # Map nodes to station names
+
+    # Draw the Watts-Strogatz graph with labels (a sampled view above RENDER_MAX_NODES nodes)
+    if rendering_enabled():
+        plt = pyplot()
+        view, view_labels, node_sizes = render_view(ws_graph, labels)
+        plt.figure(figsize=(10, 10))
+        nx.draw(view, labels=view_labels, with_labels=len(view) <= LABEL_MAX_NODES, node_color='lightblue', node_size=node_sizes, edge_color='gray', font_size=9, font_weight='bold')
+        plt.title(f"Watts-Strogatz Small-World Network ({len(view)} of {len(ws_graph)} Stations)")
+        finish_figure('watts_strogatz_network')
+
+    #degree distribution
+    plot_degree_distribution(ws_graph)
+
+    avg_path_length = calculate_average_path_length(ws_graph)
+    print("Average path length:", avg_path_length)
+
+    node_clustering, average_clustering = calculate_clustering_coefficients(ws_graph)
+    print("Average Clustering Coefficient:", average_clustering)
+    #print("Node Clustering Coefficients:", node_clustering)
+
+    node_betweenness, average_betweenness = calculate_betweenness_centrality(ws_graph)
+    print("Average Betweenness Centrality:", average_betweenness)
+    #print("Node Betweenness Centrality:", node_betweenness)
+    return ws_graph
+
+# Function to run the dataset analysis from the command line
+# Example: python -m divvy_network dataset --max-stations 1000 --k 4 --p 0.1
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='divvy_network dataset', description="Watts-Strogatz metrics over the stations of a Divvy trip CSV")
+    parser.add_argument('--file', default=DEFAULT_FILE_PATH, help="Divvy trip CSV")
+    parser.add_argument('--max-stations', type=int, default=15000, help="number of stations (nodes) to use")
+    parser.add_argument('--k', type=int, default=3, help="nearest neighbors")
+    parser.add_argument('--p', type=float, default=0.5, help="rewiring probability")
+    args = parser.parse_args(argv)
+    run_dataset(args.file, args.max_stations, args.k, args.p)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,181 @@
+# pandas is imported inside each loader, so importing this module for its constants stays cheap
+
+# Default location of the bundled Divvy sample
+DEFAULT_FILE_PATH = 'Divvy_Trips_20240503_17k.csv'
+
+# Explicit dtypes for the Divvy columns the scripts use; everything else is never parsed
+DIVVY_DTYPES = {
+    'TRIP ID': 'int64',
+    'BIKE ID': 'Int32',
+    'TRIP DURATION': 'float32',
+    'FROM STATION ID': 'Int32',
+    'TO STATION ID': 'Int32',
+    'FROM STATION NAME': 'category',
+    'TO STATION NAME': 'category',
+    'USER TYPE': 'category',
+    'GENDER': 'category',
+    'FROM LATITUDE': 'float32',
+    'FROM LONGITUDE': 'float32',
+    'TO LATITUDE': 'float32',
+    'TO LONGITUDE': 'float32',
+}
+
+STATION_ID_COLUMNS = ['FROM STATION ID', 'TO STATION ID']
+STATION_NAME_COLUMNS = ['FROM STATION NAME', 'TO STATION NAME']
+TRIP_TIME_COLUMNS = ['START TIME', 'STOP TIME']
+
+# Timestamp format of the bundled export; other exports fall back to per-value parsing
+DIVVY_TIME_FORMAT = '%m/%d/%Y %H:%M'
+
+# Function to build read_csv arguments that parse only the requested columns
+def _read_csv_kwargs(columns):
+    return {
+        'usecols': columns,
+        'dtype': {c: DIVVY_DTYPES[c] for c in columns if c in DIVVY_DTYPES},
+        # Older Divvy exports write durations such as "1,024.0"
+        'thousands': ',',
+    }
+
+# Function to load only the needed Divvy columns into memory
+def load_divvy_trips(file_path, columns):
+    import pandas as pd
+    return pd.read_csv(file_path, **_read_csv_kwargs(columns))
+
+# Function to stream the Divvy CSV in chunks of chunksize rows
+def iter_divvy_chunks(file_path, columns, chunksize=1_000_000):
+    import pandas as pd
+    yield from pd.read_csv(file_path, chunksize=chunksize, **_read_csv_kwargs(columns))
+
+# Function to add one chunk's per-key aggregates (Series or DataFrame) to the running table
+# Concatenating and regrouping with sort=False keeps keys in first-appearance order, so chunked
+# and single-pass loads return identical row orders (Series.add would realign and sort them).
+def _add_chunk_aggregates(total, part, sort=False):
+    import pandas as pd
+    if total is None:
+        return part
+    return pd.concat([total, part]).groupby(level=list(range(part.index.nlevels)), sort=sort).sum()
+
+# Function to count trips per (FROM STATION ID, TO STATION ID) pair
+# With chunksize set, counts are aggregated chunk by chunk so only one chunk
+# and the running pair table are ever held in memory.
+def load_trip_pair_counts(file_path, chunksize=None):
+    import pandas as pd
+    if chunksize is None:
+        chunks = [load_divvy_trips(file_path, STATION_ID_COLUMNS)]
+    else:
+        chunks = iter_divvy_chunks(file_path, STATION_ID_COLUMNS, chunksize)
+
+    pair_counts = None
+    for chunk in chunks:
+        counts = chunk.dropna().groupby(STATION_ID_COLUMNS, sort=False).size()
+        pair_counts = _add_chunk_aggregates(pair_counts, counts)
+
+    if pair_counts is None:
+        return pd.DataFrame({'FROM STATION ID': [], 'TO STATION ID': [], 'COUNT': []})
+    return pair_counts.astype('int64').rename('COUNT').reset_index()
+
+# Function to count trips and average TRIP DURATION (seconds) per (FROM STATION ID, TO STATION ID) pair
+# Chunked like load_trip_pair_counts: duration sums and counts are added up, then divided once.
+def load_trip_pair_stats(file_path, chunksize=None):
+    import pandas as pd
+    columns = STATION_ID_COLUMNS + ['TRIP DURATION']
+    if chunksize is None:
+        chunks = [load_divvy_trips(file_path, columns)]
+    else:
+        chunks = iter_divvy_chunks(file_path, columns, chunksize)
+
+    totals = None
+    for chunk in chunks:
+        grouped = chunk.dropna().astype({'TRIP DURATION': 'float64'}).groupby(STATION_ID_COLUMNS, sort=False).agg(
+            COUNT=('TRIP DURATION', 'size'), DURATION=('TRIP DURATION', 'sum'))
+        totals = _add_chunk_aggregates(totals, grouped)
+
+    if totals is None:
+        return pd.DataFrame({'FROM STATION ID': [], 'TO STATION ID': [], 'COUNT': [], 'MEAN DURATION': []})
+    return pd.DataFrame({
+        'COUNT': totals['COUNT'].astype('int64'),
+        'MEAN DURATION': totals['DURATION'] / totals['COUNT'],
+    }).reset_index()
+
+# Function to map every station ID to its name, taking the first name seen for each ID
+def load_station_names(file_path, chunksize=None):
+    import pandas as pd
+    columns = STATION_ID_COLUMNS + STATION_NAME_COLUMNS
+    if chunksize is None:
+        chunks = [load_divvy_trips(file_path, columns)]
+    else:
+        chunks = iter_divvy_chunks(file_path, columns, chunksize)
+
+    station_names = {}
+    for chunk in chunks:
+        for id_column, name_column in zip(STATION_ID_COLUMNS, STATION_NAME_COLUMNS):
+            pairs = chunk[[id_column, name_column]].dropna().drop_duplicates(id_column)
+            for station_id, station_name in zip(pairs[id_column].tolist(), pairs[name_column].tolist()):
+                station_names.setdefault(station_id, station_name)
+
+    return pd.DataFrame({
+        'STATION ID': pd.array(sorted(station_names), dtype='Int32'),
+        'STATION NAME': [station_names[station_id] for station_id in sorted(station_names)],
+    })
+
+STATION_COORDINATE_COLUMNS = ['FROM STATION ID', 'FROM LATITUDE', 'FROM LONGITUDE',
+                              'TO STATION ID', 'TO LATITUDE', 'TO LONGITUDE']
+
+# Function to average the recorded latitude/longitude of every station over all trips
+def load_station_coordinates(file_path, chunksize=None):
+    import pandas as pd
+    if chunksize is None:
+        chunks = [load_divvy_trips(file_path, STATION_COORDINATE_COLUMNS)]
+    else:
+        chunks = iter_divvy_chunks(file_path, STATION_COORDINATE_COLUMNS, chunksize)
+
+    sums = None
+    for chunk in chunks:
+        for side in ('FROM', 'TO'):
+            part = chunk[[f'{side} STATION ID', f'{side} LATITUDE', f'{side} LONGITUDE']].dropna()
+            part.columns = ['STATION ID', 'LATITUDE', 'LONGITUDE']
+            grouped = part.astype({'LATITUDE': 'float64', 'LONGITUDE': 'float64'}).groupby('STATION ID').agg(
+                LATITUDE=('LATITUDE', 'sum'), LONGITUDE=('LONGITUDE', 'sum'), TRIPS=('LATITUDE', 'size'))
+            # Sorted by station ID, as the single-pass groupby is
+            sums = _add_chunk_aggregates(sums, grouped, sort=True)
+
+    if sums is None:
+        return pd.DataFrame({'STATION ID': [], 'LATITUDE': [], 'LONGITUDE': []})
+    coordinates = pd.DataFrame({
+        'LATITUDE': sums['LATITUDE'] / sums['TRIPS'],
+        'LONGITUDE': sums['LONGITUDE'] / sums['TRIPS'],
+    })
+    return coordinates.reset_index()
+
+# Function to parse START TIME / STOP TIME into datetimes
+def _parse_trip_times(chunk):
+    import pandas as pd
+    for column in TRIP_TIME_COLUMNS:
+        try:
+            chunk[column] = pd.to_datetime(chunk[column], format=DIVVY_TIME_FORMAT)
+        except ValueError:
+            chunk[column] = pd.to_datetime(chunk[column], format='mixed')
+    return chunk
+
+# Function to stream trips (START/STOP TIME and station IDs) in START TIME order, chunksize rows at a time
+# Files already sorted by START TIME can be read chunk by chunk with presorted=True; otherwise only
+# these four columns are loaded and sorted, which is far smaller than the full table.
+def iter_trips_by_start_time(file_path, chunksize=100_000, presorted=False):
+    columns = TRIP_TIME_COLUMNS + STATION_ID_COLUMNS
+    if presorted:
+        last_start = None
+        for chunk in iter_divvy_chunks(file_path, columns, chunksize):
+            chunk = _parse_trip_times(chunk)
+            starts = chunk['START TIME']
+            if len(chunk) == 0:
+                continue
+            if not starts.is_monotonic_increasing or (last_start is not None and starts.iloc[0] < last_start):
+                raise ValueError(f"{file_path} is not sorted by START TIME; use presorted=False")
+            last_start = starts.iloc[-1]
+            yield chunk
+        return
+
+    trips = _parse_trip_times(load_divvy_trips(file_path, columns))
+    trips = trips.sort_values('START TIME', kind='stable', ignore_index=True)
+    for start in range(0, len(trips), chunksize):
+        yield trips.iloc[start:start + chunksize]
@@ -0,0 +1,132 @@
+from collections import Counter
+
+# Tracks components, triangles, clustering and degrees of a growing graph as edges are added
+# Every update costs O(min(deg(u), deg(v))), so per-iteration metrics are proportional to the
+# number of added edges instead of the size of the graph. Edges must be added through this
+# tracker (add_edge/add_nodes_from); edge removals are not supported, which suits growth loops.
+class IncrementalGraphMetrics:
+    def __init__(self, G):
+        self.G = G
+        self.parent = {}
+        self.component_size = {}
+        self.num_components = 0
+        self.largest_component = 0
+        # Union-find root of the largest component and the member nodes of every root
+        self.largest_root = None
+        self.members = {}
+        self.triangles = {}
+        self.degree_counts = Counter()
+        self.clustering_sum = 0.0
+
+        for node in G:
+            self._add_node(node)
+        # Replay existing edges on an empty adjacency so triangles are counted once
+        existing_edges = list(G.edges(data=True))
+        G.remove_edges_from(list(G.edges()))
+        for u, v, data in existing_edges:
+            self.add_edge(u, v, **data)
+
+    def _add_node(self, node):
+        if node in self.parent:
+            return
+        self.G.add_node(node)
+        self.parent[node] = node
+        self.component_size[node] = 1
+        self.num_components += 1
+        self.members[node] = [node]
+        if self.largest_component < 1:
+            self.largest_component, self.largest_root = 1, node
+        self.triangles[node] = 0
+        self.degree_counts[0] += 1
+
+    # Function to find a node's component root, halving the path as it goes
+    def _find(self, node):
+        parent = self.parent
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    def _union(self, u, v):
+        root_u, root_v = self._find(u), self._find(v)
+        if root_u == root_v:
+            return
+        if self.component_size[root_u] < self.component_size[root_v]:
+            root_u, root_v = root_v, root_u
+        self.parent[root_v] = root_u
+        self.component_size[root_u] += self.component_size.pop(root_v)
+        # Smaller member list into the larger one: O(n log n) over the whole growth
+        self.members[root_u].extend(self.members.pop(root_v))
+        self.num_components -= 1
+        # Components only ever merge, so the largest one can be tracked with a running max
+        if self.component_size[root_u] >= self.largest_component:
+            self.largest_component, self.largest_root = self.component_size[root_u], root_u
+
+    def _local_clustering(self, node):
+        degree = len(self.G[node]) - (1 if node in self.G[node] else 0)
+        if degree < 2:
+            return 0.0
+        return 2 * self.triangles[node] / (degree * (degree - 1))
+
+    def add_nodes_from(self, nodes):
+        for node in nodes:
+            self._add_node(node)
+
+    def _shift_degree(self, node, delta):
+        degree = self.G.degree(node)
+        self.degree_counts[degree] -= 1
+        if self.degree_counts[degree] == 0:
+            del self.degree_counts[degree]
+        self.degree_counts[degree + delta] += 1
+
+    def add_edge(self, u, v, **attr):
+        self._add_node(u)
+        self._add_node(v)
+        if self.G.has_edge(u, v):
+            # Existing edges only get their attributes updated
+            self.G.add_edge(u, v, **attr)
+            return
+        if u == v:
+            # Self-loops count twice towards degree but, as in nx.clustering, not towards triangles
+            self._shift_degree(u, 2)
+            self.G.add_edge(u, v, **attr)
+            return
+
+        adj_u, adj_v = self.G[u], self.G[v]
+        smaller, larger = (adj_u, adj_v) if len(adj_u) < len(adj_v) else (adj_v, adj_u)
+        common = [w for w in smaller if w != u and w != v and w in larger]
+
+        affected = [u, v] + common
+        self.clustering_sum -= sum(self._local_clustering(w) for w in affected)
+        self._shift_degree(u, 1)
+        self._shift_degree(v, 1)
+
+        self.G.add_edge(u, v, **attr)
+        self.triangles[u] += len(common)
+        self.triangles[v] += len(common)
+        for w in common:
+            self.triangles[w] += 1
+
+        self.clustering_sum += sum(self._local_clustering(w) for w in affected)
+        self._union(u, v)
+
+    def average_clustering(self):
+        return self.clustering_sum / len(self.parent) if self.parent else 0.0
+
+    def number_connected_components(self):
+        return self.num_components
+
+    def largest_component_size(self):
+        return self.largest_component
+
+    # Function to return the nodes of the largest connected component (no graph traversal)
+    def largest_component_nodes(self):
+        return self.members[self.largest_root] if self.largest_root is not None else []
+
+    # Function to return the degree histogram as {degree: number of nodes}
+    def degree_histogram(self):
+        return dict(sorted(self.degree_counts.items()))
+
+    # Function to expand the histogram into one degree per node, as G.degree would give
+    def degrees(self):
+        return [degree for degree, count in self.degree_histogram().items() for _ in range(count)]
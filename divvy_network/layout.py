@@ -0,0 +1,146 @@
+import hashlib
+import math
+import os
+import random
+
+import networkx as nx
+import numpy as np
+
+# Default directory for cached layouts, relative to the working directory (the trip table cache
+# instead sits in a .divvy_cache directory next to its CSV; see trip_cache.py)
+LAYOUT_CACHE_DIR = os.path.join('.divvy_cache', 'layouts')
+# Least recently used layouts beyond this many files are deleted from the cache directory
+LAYOUT_CACHE_MAX_FILES = 200
+
+# Function to place every node of G, reusing previous positions and putting new nodes
+# next to their already-placed neighbors (or at random inside the current extent)
+def warm_start_positions(G, previous_pos=None, seed=None):
+    rng = random.Random(seed)
+    pos = {node: np.asarray(previous_pos[node], dtype=float) for node in G if previous_pos and node in previous_pos}
+    if pos:
+        xy = np.array(list(pos.values()))
+        low, high = xy.min(axis=0), xy.max(axis=0)
+        spread = max(float((high - low).max()), 1e-3)
+    else:
+        low, high, spread = np.array([-1.0, -1.0]), np.array([1.0, 1.0]), 2.0
+
+    # Breadth-first from placed nodes so chains of new nodes grow outwards from the old layout
+    pending = [node for node in G if node not in pos]
+    for _ in range(len(pending) + 1):
+        if not pending:
+            break
+        still_pending = []
+        for node in pending:
+            placed = [pos[n] for n in G[node] if n in pos and n != node]
+            if placed:
+                jitter = np.array([rng.uniform(-1, 1), rng.uniform(-1, 1)]) * spread * 0.02
+                pos[node] = np.mean(placed, axis=0) + jitter
+            else:
+                still_pending.append(node)
+        if len(still_pending) == len(pending):
+            # No neighbor placed anywhere: scatter the rest over the current extent
+            for node in still_pending:
+                pos[node] = np.array([rng.uniform(low[0], high[0]), rng.uniform(low[1], high[1])])
+            break
+        pending = still_pending
+    return pos
+
+# Function to lay out G with spring forces, warm-started from the previous iteration's positions
+# With previous positions, far fewer iterations are needed and the layout no longer jumps;
+# fix_existing=True pins old nodes and only moves the new ones.
+def incremental_spring_layout(G, previous_pos=None, iterations=50, warm_iterations=15, fix_existing=False, seed=None):
+    if not previous_pos or not any(node in previous_pos for node in G):
+        return nx.spring_layout(G, iterations=iterations, seed=seed)
+    initial = warm_start_positions(G, previous_pos, seed=seed)
+    fixed = [node for node in G if node in previous_pos] if fix_existing else None
+    if fixed is not None and len(fixed) == len(G):
+        return initial
+    return nx.spring_layout(G, pos=initial, fixed=fixed, iterations=warm_iterations, seed=seed)
+
+# Function to lay out nodes at their real station locations
+# coordinates maps node -> (latitude, longitude); longitudes are scaled by cos(latitude) so
+# distances are roughly true. Nodes without coordinates are warm-started next to neighbors.
+def geographic_layout(G, coordinates, previous_pos=None, seed=None):
+    known = [coordinates[node] for node in G if node in coordinates]
+    if not known:
+        return incremental_spring_layout(G, previous_pos, seed=seed)
+    lat0 = math.radians(float(np.mean([lat for lat, _ in known])))
+    pos = {node: np.array([coordinates[node][1] * math.cos(lat0), coordinates[node][0]])
+           for node in G if node in coordinates}
+    if previous_pos:
+        pos.update({node: np.asarray(xy) for node, xy in previous_pos.items() if node in G and node not in pos})
+    return warm_start_positions(G, pos, seed=seed)
+
+# Function to map graph nodes to station coordinates given node -> station ID labels
+def station_node_coordinates(node_labels, station_coordinates):
+    by_id = {int(row[0]): (float(row[1]), float(row[2]))
+             for row in station_coordinates[['STATION ID', 'LATITUDE', 'LONGITUDE']].itertuples(index=False)}
+    return {node: by_id[station_id] for node, station_id in node_labels.items() if station_id in by_id}
+
+# Function to feed a layout argument (dicts of positions or coordinates, arrays, scalars) to a hash
+def _update_digest(digest, value):
+    if isinstance(value, dict):
+        for key in sorted(value, key=repr):
+            digest.update(repr(key).encode('utf-8'))
+            _update_digest(digest, value[key])
+    elif isinstance(value, (np.ndarray, list, tuple)):
+        array = np.asarray(value)
+        digest.update(repr((array.dtype.str, array.shape)).encode('utf-8'))
+        digest.update(array.tobytes())
+    else:
+        digest.update(repr(value).encode('utf-8'))
+
+# Function to fingerprint a graph version from its node and edge lists
+# params are the layout arguments (coordinates, previous positions, seed, ...), so the same
+# topology laid out from different inputs gets a different fingerprint.
+def graph_fingerprint(G, method='', **params):
+    digest = hashlib.sha1(method.encode('utf-8'))
+    digest.update(repr(sorted(G.nodes())).encode('utf-8'))
+    digest.update(repr(sorted(tuple(sorted(edge)) for edge in G.edges())).encode('utf-8'))
+    for name in sorted(params):
+        digest.update(name.encode('utf-8'))
+        _update_digest(digest, params[name])
+    return digest.hexdigest()[:16]
+
+# Function to delete the least recently used layouts beyond max_files
+def _prune_layout_cache(cache_dir, max_files=LAYOUT_CACHE_MAX_FILES):
+    paths = [os.path.join(cache_dir, name) for name in os.listdir(cache_dir) if name.endswith('.npz') and '.tmp' not in name]
+    if len(paths) <= max_files:
+        return
+    paths.sort(key=os.path.getmtime)
+    for path in paths[:len(paths) - max_files]:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+# Function to compute a layout through an on-disk cache keyed by graph version, method and arguments
+# Cache hits are touched so pruning keeps the most recently used LAYOUT_CACHE_MAX_FILES layouts.
+def cached_layout(G, layout_function, cache_dir=LAYOUT_CACHE_DIR, **kwargs):
+    path = os.path.join(cache_dir, f"{graph_fingerprint(G, layout_function.__name__, **kwargs)}.npz")
+    if os.path.exists(path):
+        os.utime(path)
+        cached = np.load(path)
+        return {node: xy for node, xy in zip(cached['nodes'].tolist(), cached['positions'])}
+
+    pos = layout_function(G, **kwargs)
+    os.makedirs(cache_dir, exist_ok=True)
+    nodes = list(pos)
+    np.savez(path + '.tmp.npz', nodes=np.asarray(nodes), positions=np.array([pos[n] for n in nodes]))
+    os.replace(path + '.tmp.npz', path)
+    _prune_layout_cache(cache_dir)
+    return pos
+
+# Function to get positions for a render_view() view from positions computed on the full graph
+# Aggregated views put each cluster at its members' centroid; without positions, the view is
+# laid out from scratch.
+def positions_for_view(view, pos=None, clusters=None):
+    if pos is None:
+        return incremental_spring_layout(view)
+    if view.graph.get('aggregated', False):
+        return {idx: np.mean([pos[n] for n in cluster if n in pos] or [np.zeros(2)], axis=0)
+                for idx, cluster in enumerate(clusters)}
+    missing = [node for node in view if node not in pos]
+    if missing:
+        return warm_start_positions(view, pos)
+    return {node: pos[node] for node in view}
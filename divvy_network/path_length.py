@@ -0,0 +1,77 @@
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+
+import networkx as nx
+
+# Components up to this many nodes use the exact all-pairs average when estimating automatically
+EXACT_PATH_LENGTH_MAX_NODES = 2000
+
+# Graph shared with worker processes, set once per worker by _init_bfs_worker
+_worker_graph = None
+
+def _init_bfs_worker(G):
+    global _worker_graph
+    _worker_graph = G
+
+# Function to return each source's mean distance to every other node (G must be connected)
+def _mean_distances(G, sources):
+    n = len(G)
+    return [sum(nx.single_source_shortest_path_length(G, s).values()) / (n - 1) for s in sources]
+
+def _mean_distances_in_worker(sources):
+    return _mean_distances(_worker_graph, sources)
+
+# Function to estimate the average shortest path length of a connected graph from sampled BFS sources
+# Returns (estimate, (low, high)) where (low, high) is a normal-approximation confidence interval
+# with finite-population correction. workers > 1 (or None for all cores) spreads the BFS sweeps
+# over a process pool.
+def sampled_average_path_length(G, num_sources=256, confidence=0.95, seed=None, workers=1):
+    n = len(G)
+    if n < 2:
+        return 0.0, (0.0, 0.0)
+
+    rng = random.Random(seed)
+    sources = rng.sample(list(G), min(num_sources, n))
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        means = _mean_distances(G, sources)
+    else:
+        batches = [sources[i::workers] for i in range(workers)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_bfs_worker, initargs=(G,)) as executor:
+            means = [m for batch in executor.map(_mean_distances_in_worker, batches) for m in batch]
+
+    k = len(means)
+    estimate = sum(means) / k
+    if k == n or k < 2:
+        # Every source was used, so the estimate is exact
+        return estimate, (estimate, estimate)
+
+    variance = sum((m - estimate) ** 2 for m in means) / (k - 1)
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    half_width = z * math.sqrt(variance / k) * math.sqrt((n - k) / (n - 1))
+    return estimate, (estimate - half_width, estimate + half_width)
+
+# Function to compute the average path length of the largest connected component
+# Exact for components up to exact_max_nodes nodes, sampled BFS estimate above that.
+# largest_component: the component's nodes when the caller already tracks them (e.g.
+# IncrementalGraphMetrics.largest_component_nodes()), which skips finding the components.
+def average_path_length(G, exact_max_nodes=EXACT_PATH_LENGTH_MAX_NODES, num_sources=256, seed=None, workers=1,
+                        largest_component=None):
+    if largest_component is not None:
+        subgraph = G if len(largest_component) == len(G) else G.subgraph(largest_component)
+    elif nx.is_connected(G):
+        subgraph = G
+    else:
+        largest_cc = max(nx.connected_components(G), key=len)
+        subgraph = G.subgraph(largest_cc)
+
+    if len(subgraph) <= exact_max_nodes:
+        return nx.average_shortest_path_length(subgraph)
+
+    # Copy so the BFS sweeps (and any pickling for workers) run on a plain graph, not a view
+    estimate, _ = sampled_average_path_length(subgraph.copy(), num_sources=num_sources, seed=seed, workers=workers)
+    return estimate
@@ -0,0 +1,148 @@
+import cProfile
+import csv
+import json
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# What profile_stage() records: 'time' (wall and CPU seconds), 'memory' (the stage's tracemalloc
+# peak above its starting memory, which slows allocation-heavy code down noticeably) and
+# 'cprofile' (a .prof dump per top-level stage).
+# Set DIVVY_PROFILE to a comma-separated list of these ('all' for every one, '1' for 'time') and
+# DIVVY_PROFILE_DIR for the report directory, or call configure_profiling() before the first stage.
+# The environment is read when profiling is first used, not on import.
+PROFILE_OPTIONS = ('time', 'memory', 'cprofile')
+PROFILE_COLUMNS = ['run', 'iteration', 'stage', 'depth', 'wall_s', 'cpu_s', 'peak_mb', 'allocated_mb']
+profile_dir = None
+# Report names start with this (the CLI sets its command name); None uses the script name
+report_prefix = None
+
+# None until configured (explicitly or from DIVVY_PROFILE on first use)
+_options = None
+_run_id = time.strftime('%Y%m%d-%H%M%S')
+_iteration = None
+_records = []
+_stack = []
+_active_profiler = None
+
+# Function to parse an options string such as 'time,memory' into a set of PROFILE_OPTIONS
+def _parse_options(value):
+    value = (value or '').strip().lower()
+    if value in ('', '0', 'off', 'false'):
+        return set()
+    if value in ('1', 'on', 'true'):
+        return {'time'}
+    if value == 'all':
+        return set(PROFILE_OPTIONS)
+    options = {option.strip() for option in value.split(',') if option.strip()}
+    unknown = options - set(PROFILE_OPTIONS)
+    if unknown:
+        raise ValueError(f"profile options must be among {PROFILE_OPTIONS}, got {sorted(unknown)}")
+    # Memory and cProfile records are only useful next to the stage timings
+    return options | {'time'}
+
+# Function to switch profiling on or off at runtime, e.g. from a command-line flag
+def configure_profiling(options, output_dir=None):
+    global _options, profile_dir
+    if options is not None and not isinstance(options, str):
+        options = ','.join(options)
+    _options = _parse_options(options)
+    if output_dir is not None:
+        profile_dir = output_dir
+    elif profile_dir is None:
+        profile_dir = os.environ.get('DIVVY_PROFILE_DIR', 'profiles')
+    if 'memory' in _options and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+# Function to return the active options, configuring from DIVVY_PROFILE on first call
+def _active_options():
+    if _options is None:
+        configure_profiling(os.environ.get('DIVVY_PROFILE'))
+    return _options
+
+def profiling_enabled():
+    return bool(_active_options())
+
+# Function to tag the following stage records with an iteration number (None = setup)
+def set_profile_iteration(iteration):
+    global _iteration
+    _iteration = iteration
+
+# Function to time one pipeline stage: with profile_stage('expansion'): ...
+# Stages may nest; depth records how deep. Memory peaks of nested stages count towards their
+# parents, and only the outermost running stage is cProfiled. Does nothing when profiling is off.
+@contextmanager
+def profile_stage(name):
+    global _active_profiler
+    options = _active_options()
+    if not options:
+        yield
+        return
+
+    record = {'run': _run_id, 'iteration': _iteration, 'stage': name, 'depth': len(_stack),
+              'wall_s': None, 'cpu_s': None, 'peak_mb': None, 'allocated_mb': None}
+    tracing = 'memory' in options and tracemalloc.is_tracing()
+    if tracing:
+        current, peak = tracemalloc.get_traced_memory()
+        if _stack:
+            # Keep the parent's peak so far before the counter is reset for this stage
+            _stack[-1]['_peak'] = max(_stack[-1].get('_peak', 0), peak)
+        tracemalloc.reset_peak()
+        record['_start_memory'] = current
+    profiler = None
+    if 'cprofile' in options and _active_profiler is None:
+        profiler = _active_profiler = cProfile.Profile()
+        profiler.enable()
+
+    _stack.append(record)
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    try:
+        yield
+    finally:
+        record['wall_s'] = time.perf_counter() - wall_start
+        record['cpu_s'] = time.process_time() - cpu_start
+        _stack.pop()
+        if profiler is not None:
+            profiler.disable()
+            _active_profiler = None
+            os.makedirs(profile_dir, exist_ok=True)
+            iteration = 'setup' if _iteration is None else f"iter{_iteration}"
+            profiler.dump_stats(os.path.join(profile_dir, f"{_report_name()}_{iteration}_{name}.prof"))
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            peak = max(record.pop('_peak', 0), peak)
+            start_memory = record.pop('_start_memory')
+            # The stage's own peak: memory held before it started is not counted
+            record['peak_mb'] = max(peak - start_memory, 0) / 2 ** 20
+            record['allocated_mb'] = (current - start_memory) / 2 ** 20
+            if _stack:
+                _stack[-1]['_peak'] = max(_stack[-1].get('_peak', 0), peak)
+        _records.append(record)
+
+# Function to return the stage records collected so far
+def profile_records():
+    return list(_records)
+
+def _report_name():
+    script = report_prefix or os.path.splitext(os.path.basename(sys.argv[0]))[0]
+    if script in ('', '-', '-c', '__main__'):
+        script = 'divvy'
+    return f"{script}_{_run_id}"
+
+# Function to write every record so far as <script>_<run>.json and .csv in the profile directory
+# Call it at the end of each iteration: the files are rewritten, so a crashed run keeps the
+# iterations that finished. Returns the JSON path, or None when profiling is off.
+def write_profile_report():
+    if not _active_options():
+        return None
+    os.makedirs(profile_dir, exist_ok=True)
+    base = os.path.join(profile_dir, _report_name())
+    with open(base + '.json', 'w') as f:
+        json.dump({'run': _run_id, 'script': sys.argv[0], 'options': sorted(_options), 'stages': _records}, f, indent=1)
+    with open(base + '.csv', 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=PROFILE_COLUMNS)
+        writer.writeheader()
+        writer.writerows(_records)
+    return base + '.json'
@@ -0,0 +1,118 @@
+import itertools
+import os
+import sys
+
+# How figures are handled: 'show' opens windows (the default), 'save' writes PNGs to the
+# plot directory, 'off' skips rendering entirely. Set with DIVVY_RENDER / DIVVY_PLOT_DIR
+# or configure_rendering() before any plotting. The environment is read on first use, not
+# on import, so a bad DIVVY_RENDER only fails the code that renders.
+RENDER_MODES = ('show', 'save', 'off')
+render_mode = None
+plot_dir = None
+
+# Graphs above this many nodes are drawn as a sampled or aggregated view
+RENDER_MAX_NODES = 500
+# Node labels are only drawn up to this many nodes
+LABEL_MAX_NODES = 100
+
+_figure_counter = itertools.count(1)
+# Saved figure names start with this (the CLI sets its command name); None uses the script name
+figure_prefix = None
+_pyplot = None
+
+# Function to import matplotlib.pyplot on first use, choosing the backend first
+# Matplotlib costs most of a second to import, so nothing imports it until a figure is drawn.
+def pyplot():
+    global _pyplot
+    if _pyplot is None:
+        import matplotlib
+        if current_render_mode() != 'show':
+            # Headless: never touch a display
+            matplotlib.use('Agg')
+        import matplotlib.pyplot
+        _pyplot = matplotlib.pyplot
+    return _pyplot
+
+# `from .rendering import plt` still works; it imports pyplot at that point
+def __getattr__(name):
+    if name == 'plt':
+        return pyplot()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Function to return the render mode, reading DIVVY_RENDER / DIVVY_PLOT_DIR on first call
+def current_render_mode():
+    if render_mode is None:
+        mode = os.environ.get('DIVVY_RENDER', 'show')
+        if mode not in RENDER_MODES:
+            raise ValueError(f"DIVVY_RENDER must be one of {RENDER_MODES}, got {mode!r}")
+        configure_rendering(mode)
+    return render_mode
+
+# Function to switch render mode (and plot directory) at runtime, e.g. from a batch job
+def configure_rendering(mode, output_dir=None):
+    global render_mode, plot_dir
+    if mode not in RENDER_MODES:
+        raise ValueError(f"render mode must be one of {RENDER_MODES}, got {mode!r}")
+    if mode != 'show' and _pyplot is not None:
+        _pyplot.switch_backend('Agg')
+    render_mode = mode
+    if output_dir is not None:
+        plot_dir = output_dir
+    elif plot_dir is None:
+        plot_dir = os.environ.get('DIVVY_PLOT_DIR', 'plots')
+
+def rendering_enabled():
+    return current_render_mode() != 'off'
+
+# Function to show, save or discard the current figure according to the render mode
+def finish_figure(name):
+    plt = pyplot()
+    mode = current_render_mode()
+    if mode == 'show':
+        plt.show()
+    elif mode == 'save':
+        os.makedirs(plot_dir, exist_ok=True)
+        # Prefix with the running script (or CLI command) so several jobs can share one plot directory
+        script = figure_prefix or os.path.splitext(os.path.basename(sys.argv[0]))[0]
+        if script in ('', '-', '-c', '__main__'):
+            script = 'divvy'
+        plt.savefig(os.path.join(plot_dir, f"{script}_{next(_figure_counter):03d}_{name}.png"), dpi=150)
+    plt.close()
+
+# Function to pick what to draw for G: G itself when small, otherwise a reduced view
+# With clusters, large graphs become one node per cluster (sized by member count) joined by
+# inter-cluster edges (marked with graph['aggregated']); without, a BFS sample grown from the
+# highest-degree nodes.
+# Returns (graph, labels, node_sizes) where labels is filtered to the drawn nodes.
+def render_view(G, labels=None, clusters=None, max_nodes=RENDER_MAX_NODES):
+    import networkx as nx
+    labels = labels or {}
+    if len(G) <= max_nodes:
+        return G, {n: labels[n] for n in G if n in labels}, [200] * len(G)
+
+    if clusters is not None and len(clusters) <= max_nodes:
+        cluster_of = {node: idx for idx, cluster in enumerate(clusters) for node in cluster}
+        view = nx.Graph()
+        view.add_nodes_from(range(len(clusters)))
+        for u, v in G.edges():
+            cu, cv = cluster_of.get(u), cluster_of.get(v)
+            if cu is not None and cv is not None and cu != cv:
+                weight = view.get_edge_data(cu, cv, {}).get('weight', 0)
+                view.add_edge(cu, cv, weight=weight + 1)
+        view.graph['aggregated'] = True
+        sizes = [20 + 10 * len(cluster) for cluster in clusters]
+        return view, {idx: f"C{idx} ({len(cluster)})" for idx, cluster in enumerate(clusters)}, sizes
+
+    sampled = []
+    seen = set()
+    for seed in sorted(G, key=G.degree, reverse=True):
+        if len(sampled) >= max_nodes:
+            break
+        if seed in seen:
+            continue
+        for node in nx.bfs_tree(G, seed, depth_limit=3):
+            if node not in seen and len(sampled) < max_nodes:
+                seen.add(node)
+                sampled.append(node)
+    view = G.subgraph(sampled)
+    return view, {n: labels[n] for n in view if n in labels}, [200] * len(view)
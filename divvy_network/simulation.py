@@ -0,0 +1,177 @@
+import argparse
+
+from .divvy_loader import DEFAULT_FILE_PATH, STATION_NAME_COLUMNS
+from .profiling import profile_stage, set_profile_iteration, write_profile_report
+from .rendering import pyplot, finish_figure, render_view, rendering_enabled, LABEL_MAX_NODES
+
+# As in small_world.py, networkx, pandas and the analysis modules are imported where they are used
+
+# Function to calculate network metrics for a given graph
+def calculate_network_metrics(G):
+    import networkx as nx
+    from .path_length import average_path_length
+    # Largest component only; exact up to EXACT_PATH_LENGTH_MAX_NODES nodes, sampled BFS above
+    avg_path_length = average_path_length(G)
+    avg_clustering = nx.average_clustering(G)
+
+    #degree_distribution = nx.degree_centrality(G)
+    if rendering_enabled():
+        plt = pyplot()
+        degrees = [G.degree(n) for n in G.nodes()]  # Get degrees for all nodes
+        fig, ax = plt.subplots(figsize=(7, 7))  # Adjusted for a single histogram
+        ax.hist(degrees, bins=range(max(degrees)+1), color='blue', alpha=0.7, rwidth=0.85)
+        ax.set_title('Degree Distribution')
+        ax.set_xlabel('Degree')
+        ax.set_ylabel('Frequency')
+        plt.tight_layout()
+        finish_figure('degree_distribution')
+    
+    return avg_path_length, avg_clustering
+
+# Function to apply the Girvan-Newman method for community detection
+def girvan_newman_clusters(G, num_communities=None, stop_at_modularity_peak=False, patience=None):
+    from .communities import girvan_newman_communities
+    # Betweenness is recomputed only in the component that lost an edge; by default
+    # this returns the first partition, as nx.community.girvan_newman did here
+    return girvan_newman_communities(G, num_communities, stop_at_modularity_peak, patience)
+
+# Function to map node labels to station names
+def create_node_labels(df, max_num_nodes):
+    import pandas as pd
+    unique_stations = pd.unique(df[['FROM STATION NAME', 'TO STATION NAME']].values.ravel('K'))
+    selected_stations = unique_stations[:max_num_nodes]
+    return {i: station for i, station in enumerate(selected_stations)}
+
+# Function to generate graph labels dynamically based on the number of nodes
+def generate_labels(node_labels, num_nodes):
+    return {i: node_labels.get(i, f'Node {i}') for i in range(num_nodes)}
+
+# Function to analyze clusters for insights
+def analyze_clusters(G, clusters, node_labels, workers=1):
+    from .cluster_analysis import cluster_metrics
+    insights = {
+        "Service and Maintenance": [],
+        "Targeted Marketing": [],
+        "Expansion Planning": []
+    }
+
+    # Per-cluster density and betweenness; workers > 1 (or None for all cores) runs them in a process pool
+    # Full betweenness is needed for the Service and Maintenance branch below: density > 0.1
+    metrics = cluster_metrics(G, clusters, betweenness_when=(0.1, None, 1), top_only=False, workers=workers)
+
+    for cluster, cluster_metric in zip(clusters, metrics):
+        density = cluster_metric['density']
+        num_edges = cluster_metric['num_edges']
+        print(f"Cluster Density: {density:.3f}, Number of Edges: {num_edges}, length of cluster:{len(cluster)}")
+        # Service and Maintenance: High internal usage
+        if density > 0.1:  # Example threshold
+            insights["Service and Maintenance"].append(cluster)
+            # Calculate betweenness centrality for each node (sampled for large clusters)
+            node_betweenness_centrality = cluster_metric['betweenness']
+            # Calculate the average betweenness centrality
+            average_betweenness_centrality = sum(node_betweenness_centrality.values()) / len(node_betweenness_centrality)
+            print(f"\nnode_betweenness_centrality: {node_betweenness_centrality}")
+            print(f"average_betweenness_centrality: {average_betweenness_centrality}")
+
+            # Find the node with the highest betweenness centrality
+            max_node, max_value = cluster_metric['max_node'], cluster_metric['max_value']
+
+            max_node_name = node_labels.get(max_node, "Unknown")
+
+            # Print the node with the highest betweenness centrality
+            print(f"Node with the highest betweenness centrality: {max_node} (Name: {max_node_name}), Value: {max_value}")
+
+
+        # Targeted Marketing: Low usage areas
+        if density < 0.05 :  # Example thresholds
+            insights["Targeted Marketing"].append(cluster)
+
+        # Expansion Planning: Peripheral clusters
+        if len(cluster) < 10:  # Small clusters as potential candidates for expansion
+            insights["Expansion Planning"].append(cluster)
+
+    return insights
+
+# Function to run the simulation, analyze clusters, and provide insights
+def small_world_simulation_and_insights(num_iterations, start_nodes, node_increment, nearest_neighbors, rewiring_prob, all_node_labels):
+    import networkx as nx
+    from .layout import cached_layout, incremental_spring_layout
+    from .watts_strogatz import watts_strogatz_graph
+    previous_pos = None
+    for iteration in range(num_iterations):
+        num_nodes = start_nodes + (node_increment * iteration)
+        print(f"\nIteration {iteration + 1}: {num_nodes} Nodes")
+        set_profile_iteration(iteration + 1)
+        
+        with profile_stage('graph_generation'):
+            G = watts_strogatz_graph(n=num_nodes, k=nearest_neighbors, p=rewiring_prob)
+        
+        with profile_stage('communities'):
+            clusters = girvan_newman_clusters(G)
+        print(f"Number of Clusters: {len(clusters)}")
+        
+        with profile_stage('network_metrics'):
+            avg_path_length, avg_clustering = calculate_network_metrics(G)
+        print(f"Average Path Length: {avg_path_length}")
+        print(f"Average Clustering Coefficient: {avg_clustering}")
+        
+        # Create a subset of labels that match the current graph's nodes
+        current_labels = generate_labels(all_node_labels, num_nodes)
+        
+        # Analyze clusters to generate insights
+        with profile_stage('cluster_analysis'):
+            insights = analyze_clusters(G, clusters, current_labels)
+        
+        # Display insights
+        print("\n--- Cluster Insights ---")
+        for category, cluster_list in insights.items():
+            print(f"{category}: {len(cluster_list)} Clusters")
+            for idx, cluster in enumerate(cluster_list, 1):
+                names = [current_labels.get(n, f'Node {n}') for n in cluster]
+                #print(f"  {category} Cluster {idx}: {names}")
+        
+        # Plot the graph with station names as labels; the layout is only computed when rendering
+        if rendering_enabled():
+            plt = pyplot()
+            view, view_labels, node_sizes = render_view(G, current_labels)
+            plt.figure(figsize=(10, 10))
+            # Nodes placed in the previous iteration stay pinned and only new ones move; cached per graph version
+            with profile_stage('layout'):
+                pos = cached_layout(view, incremental_spring_layout, previous_pos=previous_pos, fix_existing=True)
+            previous_pos = pos
+            nx.draw(view, pos, node_color='lightblue', node_size=node_sizes, edge_color='gray', with_labels=len(view) <= LABEL_MAX_NODES, labels=view_labels)
+            for cluster in clusters:
+                nx.draw_networkx_nodes(view, pos, nodelist=[n for n in cluster if n in pos], node_color=[(0.5, 0.5, 0.5)], node_size=200)
+            plt.title(f"Small-World Network - Iteration {iteration + 1} ({num_nodes} Nodes)")
+            finish_figure(f"iteration_{iteration + 1}_network")  # Shows, saves or discards, then closes the plot
+        # Per-stage timings so far (only when DIVVY_PROFILE is set)
+        write_profile_report()
+
+# Function to load station names from the CSV and run the simulation with insights analysis
+# (sweep.py runs grids of n, k, p and seeds in parallel)
+def run_simulation(file_path=DEFAULT_FILE_PATH, num_iterations=5, start_nodes=5, node_increment=2,
+                   nearest_neighbors=3, rewiring_prob=0.5, max_labels=800):
+    from .divvy_loader import load_divvy_trips
+    # Load station data from CSV file
+    with profile_stage('csv_load'):
+        divvy_data = load_divvy_trips(file_path, STATION_NAME_COLUMNS)
+
+    # Create node labels for up to max_labels stations
+    all_node_labels = create_node_labels(divvy_data, max_labels)
+    small_world_simulation_and_insights(num_iterations, start_nodes, node_increment, nearest_neighbors, rewiring_prob, all_node_labels)
+
+# Function to run the simulation from the command line
+# Example: python -m divvy_network simulate --iterations 5 --start-nodes 5 --increment 2
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='divvy_network simulate', description="Grow Watts-Strogatz graphs and analyze their Girvan-Newman clusters")
+    parser.add_argument('--file', default=DEFAULT_FILE_PATH, help="Divvy trip CSV (station names label the nodes)")
+    parser.add_argument('--iterations', type=int, default=5, help="number of graphs to generate")
+    parser.add_argument('--start-nodes', type=int, default=5, help="nodes in the first graph")
+    parser.add_argument('--increment', type=int, default=2, help="nodes added per iteration")
+    parser.add_argument('--k', type=int, default=3, help="nearest neighbors")
+    parser.add_argument('--p', type=float, default=0.5, help="rewiring probability")
+    args = parser.parse_args(argv)
+    run_simulation(args.file, args.iterations, args.start_nodes, args.increment, args.k, args.p)
+
+if __name__ == '__main__':
+    main()
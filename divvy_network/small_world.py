@@ -0,0 +1,396 @@
+import argparse
+
+from .divvy_loader import DEFAULT_FILE_PATH
+from .incremental_metrics import IncrementalGraphMetrics
+from .profiling import profile_stage, set_profile_iteration, write_profile_report
+from .rendering import pyplot, finish_figure, render_view, rendering_enabled, LABEL_MAX_NODES
+
+# networkx, pandas and the analysis modules built on them are imported inside the functions that
+# use them, so `from divvy_network.small_world import analyze_clusters` does not load them
+
+# Function to map station IDs to nodes
+def create_node_labels_from_ids(df, max_num_nodes):
+    import pandas as pd
+    if 'COUNT' in df.columns:
+        # Already aggregated by divvy_loader.load_trip_pair_counts
+        trips = df[['FROM STATION ID', 'TO STATION ID', 'COUNT']].sort_values('COUNT', ascending=False, kind='stable')
+    else:
+        trips = df[['FROM STATION ID', 'TO STATION ID']].dropna().value_counts().reset_index()
+    trips.columns = ['FROM', 'TO', 'COUNT']
+
+    unique_station_ids = pd.unique(trips[['FROM', 'TO']].values.ravel('K'))
+    selected_station_ids = unique_station_ids[:max_num_nodes]
+
+    station_labels = {i: int(station_id) for i, station_id in enumerate(selected_station_ids)}
+    return station_labels
+def create_station_name_labels(df, max_num_nodes):
+    import pandas as pd
+    # Get pairs of station IDs and station names
+    trips = df[['FROM STATION ID', 'FROM STATION NAME']].drop_duplicates()
+    trips.columns = ['STATION ID', 'STATION NAME']
+
+    trips_to = df[['TO STATION ID', 'TO STATION NAME']].drop_duplicates()
+    trips_to.columns = ['STATION ID', 'STATION NAME']
+
+    # Combine 'from' and 'to' pairs
+    all_stations = pd.concat([trips, trips_to]).drop_duplicates()
+
+    # Map station IDs to station names
+    station_id_to_name = dict(zip(all_stations['STATION ID'], all_stations['STATION NAME']))
+
+    # Create node labels by limiting to max_num_nodes
+    unique_station_ids = list(station_id_to_name.keys())[:max_num_nodes]
+    node_labels = {i: station_id_to_name[station_id] for i, station_id in enumerate(unique_station_ids)}
+
+    return node_labels
+
+# Function to update or extend labels dynamically using station IDs
+def update_node_labels_with_ids(existing_labels, num_new_nodes, remaining_ids):
+    next_index = max(existing_labels.keys()) + 1 if existing_labels else 0
+    updated_labels = {next_index + i: remaining_ids[i] for i in range(min(num_new_nodes, len(remaining_ids)))}
+    existing_labels.update(updated_labels)
+    return existing_labels
+
+# Function to apply Girvan-Newman clustering
+def girvan_newman_clusters(G, num_communities=None, stop_at_modularity_peak=False, patience=None):
+    from .communities import girvan_newman_communities
+    # Incremental engine: betweenness is recomputed only in the component that lost an edge
+    return girvan_newman_communities(G, num_communities, stop_at_modularity_peak, patience)
+
+# Function to analyze clusters and generate insights
+def analyze_clusters(G, clusters, betweenness_epsilon=0.05, workers=1):
+    from .cluster_analysis import cluster_metrics
+    insights = {
+        "Focused Service and Maintenance": [],
+        "Targeted Marketing": [],
+        "Expansion Planning": []
+    }
+
+    # Per-cluster density and betweenness; workers > 1 (or None for all cores) runs them in a process pool
+    # Betweenness is only needed for the Targeted Marketing branch below: density < 0.1 and size > 1
+    metrics = cluster_metrics(G, clusters, betweenness_when=(None, 0.1, 2), epsilon=betweenness_epsilon, workers=workers)
+
+    for cluster, cluster_metric in zip(clusters, metrics):
+        density = cluster_metric['density']
+        num_edges = cluster_metric['num_edges']
+        # Focused Service and Maintenance: High internal usage
+        if density > 0.2:  # Example threshold
+            insights["Focused Service and Maintenance"].append(cluster)
+
+        # Targeted Marketing: Low usage areas
+        elif density < 0.1 and len(cluster) > 1:  # Example threshold
+            insights["Targeted Marketing"].append(cluster)
+            #print closeness centrality for this cluster
+            # Only the top node is printed (betweenness is still computed for every node, sampled for large clusters)
+            max_node, max_value = cluster_metric['max_node'], cluster_metric['max_value']
+            print(f"\nTargeted Marketing : node_betweenness_centrality_max: {max_value}")
+            print(f"max_node: {max_node}")
+        # Expansion Planning: Small clusters with sparse connections
+        elif len(cluster) < 10:  # Example size threshold
+            insights["Expansion Planning"].append(cluster)
+
+    return insights
+
+# Function to visualize the graph with clusters
+# pos: positions for G's nodes (e.g. from update_layout); laid out from scratch when None
+def visualize_graph_with_clusters(G, clusters, labels, title, pos=None):
+    if not rendering_enabled():
+        return
+    import networkx as nx
+    from .layout import positions_for_view
+    # Large graphs are drawn as one node per cluster
+    plt = pyplot()
+    view, view_labels, node_sizes = render_view(G, labels, clusters)
+    aggregated = view.graph.get('aggregated', False)
+    pos = positions_for_view(view, pos, clusters)
+    plt.figure(figsize=(10, 10))
+
+    # Create a color mapping for each cluster
+    color_map = {}
+    for idx, cluster in enumerate(clusters):
+        for node in cluster:
+            color_map[node] = idx
+
+    # Generate colors based on clusters
+    colors = list(view.nodes) if aggregated else [color_map.get(node, -1) for node in view.nodes]
+
+    nx.draw(view, pos, node_color=colors, node_size=node_sizes, cmap=plt.cm.Set3, edge_color='gray', with_labels=len(view) <= LABEL_MAX_NODES, labels=view_labels)
+    plt.title(title)
+    finish_figure('graph_with_clusters')
+
+
+# Function to visualize the entire graph and separate subplots for each insight
+def visualize_graph_with_insight_colors(G, insights, labels, title, pos=None):
+    if not rendering_enabled():
+        return
+    import networkx as nx
+    from .layout import positions_for_view
+    # Large graphs are drawn as a sampled view
+    plt = pyplot()
+    view, view_labels, node_sizes = render_view(G, labels)
+    pos = positions_for_view(view, pos)
+    plt.figure(figsize=(10, 10))
+
+    # Define color mapping for each insight
+    color_mapping = {
+        "Focused Service and Maintenance": 'green',
+        "Targeted Marketing": 'blue',
+        "Expansion Planning": 'red'
+    }
+
+    # Initialize a default color for nodes not matching any insight
+    default_color = 'blue'
+
+    # Create a color map for all nodes
+    color_map = {node: default_color for node in G.nodes}
+
+    # Assign colors based on insights
+    for insight, color in color_mapping.items():
+        for cluster in insights[insight]:
+            for node in cluster:
+                color_map[node] = color
+
+    # Extract node colors for all drawn nodes
+    node_colors = [color_map.get(node, default_color) for node in view.nodes]
+
+    # Draw the graph with the node colors
+    nx.draw(view, pos, node_color=node_colors, node_size=node_sizes, edge_color='gray', with_labels=False)
+    
+    # Draw the labels separately with customized font size and color
+    if len(view) <= LABEL_MAX_NODES:
+        nx.draw_networkx_labels(view, pos, labels=view_labels, font_size=4, font_color='lightgray')
+    
+    plt.title(title)
+    finish_figure('graph_with_insight_colors')
+
+
+# Function to update the layout for this iteration, warm-started from the previous positions
+# 'geographic' places nodes at their stations' coordinates; 'spring' relaxes a warm-started
+# spring layout that pins already-placed nodes. Results are cached on disk per graph version.
+def update_layout(G, previous_pos, node_labels, station_coordinates=None, method='geographic'):
+    from .layout import cached_layout, geographic_layout, incremental_spring_layout, station_node_coordinates
+    if method == 'geographic' and station_coordinates is not None:
+        coordinates = station_node_coordinates(node_labels, station_coordinates)
+        return cached_layout(G, geographic_layout, coordinates=coordinates, previous_pos=previous_pos)
+    return cached_layout(G, incremental_spring_layout, previous_pos=previous_pos, fix_existing=True)
+
+def calculate_network_metrics(G, metrics=None):
+    import networkx as nx
+    from .path_length import average_path_length
+    if metrics is not None:
+        # Maintained incrementally by IncrementalGraphMetrics as edges were added: the largest
+        # component comes from its union-find and degrees as a {degree: count} histogram
+        avg_path_length = average_path_length(G, largest_component=metrics.largest_component_nodes())
+        return metrics.degree_histogram(), avg_path_length, metrics.average_clustering()
+
+    # Largest component only; exact up to EXACT_PATH_LENGTH_MAX_NODES nodes, sampled BFS above
+    avg_path_length = average_path_length(G)
+    avg_clustering = nx.average_clustering(G)
+
+    #degree_distribution = nx.degree_centrality(G)
+    
+    degrees = [G.degree(n) for n in G.nodes()]  # Get degrees for all nodes
+    
+    return degrees, avg_path_length, avg_clustering
+    
+
+# path_lengths and clustering_coeffs hold one value per iteration; degrees are the final graph's,
+# as a list of node degrees or a {degree: count} histogram
+def visualize_network_metrics(degrees, path_lengths, clustering_coeffs, num_iterations):
+    if not rendering_enabled():
+        return
+    plt = pyplot()
+    fig, ax = plt.subplots(figsize=(7, 7))  # Adjusted for a single histogram
+    if isinstance(degrees, dict):
+        # Weighted by node counts: the same bars as the expanded degree list
+        ax.hist(list(degrees), bins=range(max(degrees)+1), weights=list(degrees.values()), color='blue', alpha=0.7, rwidth=0.85)
+    else:
+        ax.hist(degrees, bins=range(max(degrees)+1), color='blue', alpha=0.7, rwidth=0.85)
+    ax.set_title('Degree Distribution')
+    ax.set_xlabel('Degree')
+    ax.set_ylabel('Frequency')
+    plt.tight_layout()
+    finish_figure('degree_distribution')
+    
+    plt.figure(figsize=(8, 5))
+    plt.plot(range(1, num_iterations + 1), clustering_coeffs, marker='o', linestyle='-', color='blue')
+    plt.xlabel('Iteration')
+    plt.ylabel('Average Clustering Coefficient')
+    plt.title('Clustering Coefficient Over Iterations')
+    plt.grid(True)
+    finish_figure('clustering_over_iterations')
+    
+    plt.figure(figsize=(8, 5))
+    plt.plot(range(1, num_iterations + 1), path_lengths, marker='o', linestyle='-', color='blue')
+    plt.xlabel('Iteration')
+    plt.ylabel('Average Path Length')
+    plt.title('Average path length Over Iterations')
+    plt.grid(True)
+    finish_figure('path_length_over_iterations')
+
+# Function to print directed, trip-weighted analytics for the whole station network
+def report_weighted_metrics(file_path, trip_graph_weight, chunksize=None, workers=1):
+    from .divvy_loader import load_trip_pair_stats
+    from .weighted_graph import build_trip_digraph, weighted_network_metrics
+    with profile_stage('weighted_analytics'):
+        trip_digraph = build_trip_digraph(load_trip_pair_stats(file_path, chunksize=chunksize), trip_graph_weight)
+        weighted_metrics = weighted_network_metrics(trip_digraph, workers=workers)
+    print(f"Directed trip graph ({trip_graph_weight}): {len(trip_digraph)} stations, {trip_digraph.number_of_edges()} links")
+    print(f"Weighted clustering: {weighted_metrics['avg_clustering']:.4f}, "
+          f"Dijkstra path length: {weighted_metrics['avg_path_length']:.4f} "
+          f"({weighted_metrics['reachable_pairs']:.1%} of pairs reachable)")
+    print(weighted_metrics['strengths'].describe())
+    top_flow = sorted(weighted_metrics['flow_centrality'].items(), key=lambda item: item[1], reverse=True)[:5]
+    print(f"Highest flow centrality: {top_flow}")
+    return weighted_metrics
+
+# Function to grow a small-world graph from the trip data, cluster it and analyze the clusters
+# file_path: Divvy trip CSV; chunksize e.g. 1_000_000 streams the multi-year dataset chunk by chunk
+#   (aggregated tables are cached next to the CSV and rebuilt automatically when it changes)
+# k, rewiring_prob: Watts-Strogatz parameters; increment_per_iteration nodes are added per iteration
+# community_method: 'girvan_newman', 'louvain', 'label_propagation' or 'leiden'; Girvan-Newman matches
+#   earlier results, the others scale to graphs with thousands of nodes
+# betweenness_epsilon: absolute error bound for sampled betweenness on clusters above EXACT_BETWEENNESS_MAX_NODES
+# analysis_workers: processes for per-cluster analysis (1 = serial, None = all cores)
+# geographic_wiring: wire the lattice by real station proximity (k nearest stations) instead of node
+#   index, and list stations within expansion_radius_km of each Expansion Planning cluster as candidates
+# visualize_iterations: per-iteration graph plots (need rendering enabled); layout_method 'geographic' or 'spring'
+# trip_graph_weight: directed trip graph analytics weighted by 'count' (busy links are short) or
+#   'duration'; None skips them
+def run_small_world(file_path=DEFAULT_FILE_PATH, chunksize=None, max_num_nodes=20, k=3, rewiring_prob=0.5,
+                    initial_nodes=3, increment_per_iteration=1000, num_iterations=5,
+                    community_method='girvan_newman', betweenness_epsilon=0.05, analysis_workers=1,
+                    geographic_wiring=False, expansion_radius_km=1.0, visualize_iterations=False,
+                    layout_method='geographic', trip_graph_weight=None):
+    import networkx as nx
+    from .communities import detect_communities
+    from .divvy_loader import load_station_coordinates
+    from .spatial import expansion_candidates, geographic_neighbors, StationIndex
+    from .trip_cache import load_cached_trip_tables
+    from .trip_graph import generate_station_trip_edge_arrays, build_trip_edge_index, expand_small_world_graph
+    # Load trip counts per station pair from a CSV file
+    with profile_stage('csv_load'):
+        trip_pair_counts, stations = load_cached_trip_tables(file_path, chunksize=chunksize)
+
+    all_node_labels = create_node_labels_from_ids(trip_pair_counts, max_num_nodes)
+    #station_name_labels = create_station_name_labels(divvy_data, max_num_nodes)
+
+    # Remaining station IDs to be used
+    remaining_station_ids = list(set(trip_pair_counts['FROM STATION ID']).union(set(trip_pair_counts['TO STATION ID'])))
+    remaining_station_ids = [sid for sid in remaining_station_ids if sid not in all_node_labels.values()]
+
+    # Node -> station mapping the growth loop will produce (nodes are labeled in order)
+    planned_labels = {i: all_node_labels[i] for i in range(initial_nodes)}
+    planned_labels.update((initial_nodes + i, station_id) for i, station_id in
+                          enumerate(remaining_station_ids[:num_iterations * increment_per_iteration]))
+
+    with profile_stage('edge_generation'):
+        # Geographic lattice neighbors are the nodes' real nearest stations, so their trip edges
+        # must cover every station a node can be labeled with, not just the first max_num_nodes
+        station_trip_edges = generate_station_trip_edge_arrays(trip_pair_counts, planned_labels if geographic_wiring else all_node_labels)
+        # Index the trip edges once so every growth step does O(1) neighbor lookups
+        trip_edge_index = build_trip_edge_index(station_trip_edges)
+
+    if trip_graph_weight is not None:
+        report_weighted_metrics(file_path, trip_graph_weight, chunksize, analysis_workers)
+
+    # Initialize the small-world graph
+    G_expanded = nx.Graph()
+    G_expanded.add_nodes_from(range(initial_nodes))
+    # Keeps components, triangles, clustering and degrees up to date as the graph grows
+    graph_metrics = IncrementalGraphMetrics(G_expanded)
+
+    # Initialize node labels dynamically
+    dynamic_node_labels = {i: all_node_labels[i] for i in range(initial_nodes)}
+    #dynamic_node_labels = {i: station_name_labels[i] for i in range(initial_nodes)}
+
+    clustering_coeffs = []
+    path_lengths = []
+    # Positions carried over between iterations so existing nodes keep their place
+    layout_positions = None
+    station_coordinates = None
+    if (visualize_iterations and rendering_enabled() and layout_method == 'geographic') or geographic_wiring:
+        station_coordinates = load_station_coordinates(file_path, chunksize=chunksize)
+    station_index = StationIndex.from_coordinates(station_coordinates) if geographic_wiring else None
+    # Iteratively expand the graph, cluster it, visualize it, and analyze clusters
+    for iteration in range(num_iterations):
+        print(f"Iteration {iteration + 1}: Adding {increment_per_iteration} nodes")
+        set_profile_iteration(iteration + 1)
+        with profile_stage('expansion'):
+            # Update node labels for the newly added nodes (first, so geographic wiring can use them)
+            # Each station labels one node: continue after the IDs already handed out
+            used_station_ids = len(dynamic_node_labels) - initial_nodes
+            dynamic_node_labels = update_node_labels_with_ids(dynamic_node_labels, increment_per_iteration, remaining_station_ids[used_station_ids:])
+            lattice_neighbors = geographic_neighbors(station_index, dynamic_node_labels, k) if geographic_wiring else None
+            edges_before = G_expanded.number_of_edges()
+            G_expanded = expand_small_world_graph(G_expanded, trip_edge_index, increment_per_iteration, k, rewiring_prob, graph_metrics, lattice_neighbors)
+        if geographic_wiring:
+            added_edges = G_expanded.number_of_edges() - edges_before
+            print(f"Geographic wiring: {added_edges} edges added")
+            if added_edges == 0 and lattice_neighbors:
+                print("Geographic wiring added no edges: no trip edges join the new nodes to their nearest stations")
+        with profile_stage('network_metrics'):
+            degrees, avg_path_length, avg_clustering = calculate_network_metrics(G_expanded, graph_metrics)
+        clustering_coeffs.append(avg_clustering)
+        path_lengths.append(avg_path_length)
+        # Detect clusters with the configured community detection method
+        with profile_stage('communities'):
+            clusters = detect_communities(G_expanded, method=community_method)
+        print(f"{clusters.method}: {len(clusters)} clusters, modularity {clusters.modularity:.4f}, {clusters.runtime:.2f}s")
+
+        # Visualize the graph with clusters
+        if visualize_iterations and rendering_enabled():
+            with profile_stage('layout'):
+                layout_positions = update_layout(G_expanded, layout_positions, dynamic_node_labels, station_coordinates, layout_method)
+            visualize_graph_with_clusters(G_expanded, clusters, dynamic_node_labels, f"Small-World Network Iteration {iteration + 1} ({len(G_expanded.nodes)} Nodes)", layout_positions)
+
+        # Analyze clusters and provide insights
+        with profile_stage('cluster_analysis'):
+            cluster_insights = analyze_clusters(G_expanded, clusters, betweenness_epsilon, analysis_workers)
+        print("\n--- Insights from Clusters ---")
+        for insight_type, insight_clusters in cluster_insights.items():
+            print(f"{insight_type}: {len(insight_clusters)} clusters")
+        if geographic_wiring:
+            candidates = expansion_candidates(station_index, cluster_insights["Expansion Planning"], dynamic_node_labels, expansion_radius_km)
+            with_candidates = [c for c in candidates if c]
+            print(f"Expansion Planning: {len(with_candidates)} clusters have stations within {expansion_radius_km} km")
+        print("\n" )
+        #visualize_graph_with_subplots(G_expanded, cluster_insights, dynamic_node_labels, "Network Analysis")
+        if visualize_iterations and rendering_enabled():
+            visualize_graph_with_insight_colors(G_expanded, cluster_insights, dynamic_node_labels, "Clustered Graph", layout_positions)
+        # Per-stage timings so far (only when DIVVY_PROFILE is set)
+        write_profile_report()
+
+    # Degree distribution and the clustering coefficient / path length trends over iterations
+    visualize_network_metrics(degrees, path_lengths, clustering_coeffs, num_iterations)
+    return G_expanded, dynamic_node_labels
+
+# Function to run the small-world growth from the command line
+# Example: python -m divvy_network small-world --iterations 5 --increment 1000 --method louvain
+def main(argv=None):
+    from .communities import COMMUNITY_METHODS
+    from .weighted_graph import TRIP_WEIGHTS
+    parser = argparse.ArgumentParser(prog='divvy_network small-world', description="Grow a small-world station graph from Divvy trips and analyze its clusters")
+    parser.add_argument('--file', default=DEFAULT_FILE_PATH, help="Divvy trip CSV")
+    parser.add_argument('--chunksize', type=int, default=None, help="stream the CSV in chunks of this many rows")
+    parser.add_argument('--max-nodes', type=int, default=20, help="stations labeled from the busiest trip pairs")
+    parser.add_argument('--k', type=int, default=3, help="nearest neighbors")
+    parser.add_argument('--p', type=float, default=0.5, help="rewiring probability")
+    parser.add_argument('--initial-nodes', type=int, default=3, help="nodes in the starting graph")
+    parser.add_argument('--increment', type=int, default=1000, help="nodes added per iteration")
+    parser.add_argument('--iterations', type=int, default=5, help="number of growth steps")
+    parser.add_argument('--method', default='girvan_newman', choices=sorted(COMMUNITY_METHODS), help="community detection method")
+    parser.add_argument('--epsilon', type=float, default=0.05, help="error bound for sampled betweenness")
+    parser.add_argument('--workers', type=int, default=1, help="processes for per-cluster analysis (0 = all cores)")
+    parser.add_argument('--geographic-wiring', action='store_true', help="wire the lattice by station proximity")
+    parser.add_argument('--expansion-radius', type=float, default=1.0, help="candidate radius (km) for Expansion Planning clusters")
+    parser.add_argument('--visualize-iterations', action='store_true', help="plot the graph at every iteration")
+    parser.add_argument('--layout', default='geographic', choices=['geographic', 'spring'], help="layout for per-iteration plots")
+    parser.add_argument('--trip-weight', default=None, choices=sorted(TRIP_WEIGHTS), help="also report directed trip graph analytics")
+    args = parser.parse_args(argv)
+    run_small_world(args.file, args.chunksize, args.max_nodes, args.k, args.p, args.initial_nodes, args.increment,
+                    args.iterations, args.method, args.epsilon, args.workers or None, args.geographic_wiring,
+                    args.expansion_radius, args.visualize_iterations, args.layout, args.trip_weight)
+
+if __name__ == '__main__':
+    main()
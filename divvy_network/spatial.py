@@ -0,0 +1,197 @@
+import math
+
+import numpy as np
+
+# Kilometres per degree of latitude; a degree of longitude is this times cos(latitude)
+KM_PER_DEGREE = 111.195
+
+# Uniform grid index over station coordinates for bulk radius and k-nearest queries
+# Coordinates are projected to local kilometres (equirectangular around the mean latitude, which
+# is accurate to well under 1% across a city) and bucketed into square cells sorted by cell key.
+# Building is one O(n log n) sort; a query only scans the cells its radius overlaps, and every
+# query runs vectorized over all query points at once instead of a pairwise distance scan.
+class StationIndex:
+    def __init__(self, latitudes, longitudes, ids=None, cell_km=None):
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+        self.ids = np.arange(len(latitudes)) if ids is None else np.asarray(ids)
+        self.latitudes, self.longitudes = latitudes, longitudes
+        self.lat0 = math.radians(float(latitudes.mean())) if len(latitudes) else 0.0
+        self.xy = self._project(latitudes, longitudes)
+
+        if cell_km is None:
+            # About two stations per cell on average; the longer side bounds it from below so
+            # stations along one street (zero-area extent) still get about two per cell
+            extent = np.ptp(self.xy, axis=0) if len(self.xy) else np.zeros(2)
+            num_points = max(len(self.xy), 1)
+            area = float(extent[0] * extent[1])
+            cell_km = max(math.sqrt(2 * area / num_points), 2 * float(extent.max()) / num_points, 1e-3)
+        self.cell_km = cell_km
+
+        cells = np.floor(self.xy / cell_km).astype(np.int64)
+        self.origin = cells.min(axis=0) if len(cells) else np.zeros(2, dtype=np.int64)
+        cells -= self.origin
+        self.grid_width = int(cells[:, 0].max()) + 1 if len(cells) else 1
+        self.grid_height = int(cells[:, 1].max()) + 1 if len(cells) else 1
+        keys = cells[:, 1] * self.grid_width + cells[:, 0]
+        self.order = np.argsort(keys, kind='stable')
+        # Dense per-cell offsets into order (about one cell per two stations, so this stays small)
+        self.cell_counts = np.bincount(keys, minlength=self.grid_width * self.grid_height)
+        self.cell_starts = np.cumsum(self.cell_counts) - self.cell_counts
+
+    # Function to build the index from divvy_loader.load_station_coordinates output
+    @classmethod
+    def from_coordinates(cls, station_coordinates, cell_km=None):
+        return cls(station_coordinates['LATITUDE'].to_numpy(), station_coordinates['LONGITUDE'].to_numpy(),
+                   station_coordinates['STATION ID'].to_numpy(), cell_km)
+
+    def _project(self, latitudes, longitudes):
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+        return np.column_stack([longitudes * KM_PER_DEGREE * math.cos(self.lat0), latitudes * KM_PER_DEGREE])
+
+    # Function to list candidate (query, station) pairs from the cells within reach of each query
+    # Scans cell offsets around the queries (clamped to the grid) while that is the smaller loop,
+    # otherwise the occupied cells, so huge radii or far-away queries stay cheap.
+    def _candidate_pairs(self, query_cells, reach):
+        found_queries, found_points = [], []
+        occupied = np.flatnonzero(self.cell_counts)
+        dx_range = range(max(-reach, -int(query_cells[:, 0].max())), min(reach, self.grid_width - 1 - int(query_cells[:, 0].min())) + 1)
+        dy_range = range(max(-reach, -int(query_cells[:, 1].max())), min(reach, self.grid_height - 1 - int(query_cells[:, 1].min())) + 1)
+        if len(dx_range) * len(dy_range) > len(occupied):
+            for key in occupied.tolist():
+                cx, cy = key % self.grid_width, key // self.grid_width
+                inside = np.flatnonzero((np.abs(query_cells[:, 0] - cx) <= reach) & (np.abs(query_cells[:, 1] - cy) <= reach))
+                if len(inside) == 0:
+                    continue
+                start, count = self.cell_starts[key], self.cell_counts[key]
+                found_queries.append(np.repeat(inside, count))
+                found_points.append(np.tile(self.order[start:start + count], len(inside)))
+            return found_queries, found_points
+
+        for dy in dy_range:
+            for dx in dx_range:
+                cx, cy = query_cells[:, 0] + dx, query_cells[:, 1] + dy
+                inside = np.flatnonzero((cx >= 0) & (cx < self.grid_width) & (cy >= 0) & (cy < self.grid_height))
+                keys = cy[inside] * self.grid_width + cx[inside]
+                starts, counts = self.cell_starts[keys], self.cell_counts[keys]
+                if counts.sum() == 0:
+                    continue
+                # Expand each query's [start, start + count) range into flat candidate positions
+                offsets = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+                found_queries.append(np.repeat(inside, counts))
+                found_points.append(self.order[offsets])
+        return found_queries, found_points
+
+    # Function to find every (query, station) pair within radius_km, for all queries at once
+    # Returns (query_positions, station_positions, distances_km) sorted by query, then distance.
+    def _pairs_within(self, query_xy, radius_km):
+        reach = int(math.ceil(radius_km / self.cell_km))
+        query_cells = np.floor(query_xy / self.cell_km).astype(np.int64) - self.origin
+        found_queries, found_points = self._candidate_pairs(query_cells, reach) if len(query_xy) else ([], [])
+
+        if not found_queries:
+            empty = np.array([], dtype=np.int64)
+            return empty, empty, np.array([], dtype=np.float64)
+        queries = np.concatenate(found_queries)
+        points = np.concatenate(found_points)
+        distances = np.hypot(*(query_xy[queries] - self.xy[points]).T)
+        keep = distances <= radius_km
+        queries, points, distances = queries[keep], points[keep], distances[keep]
+        # Two stable sorts (the integer one is a radix sort) beat lexsort on millions of pairs
+        order = np.argsort(distances, kind='stable')
+        order = order[np.argsort(queries[order], kind='stable')]
+        return queries[order], points[order], distances[order]
+
+    # Function to find all stations within radius_km of each (latitude, longitude) query
+    # Returns (query_positions, station_positions, distances_km) as flat arrays, grouped by query
+    # and nearest first; station_positions index self.ids.
+    def query_radius(self, latitudes, longitudes, radius_km):
+        return self._pairs_within(self._project(latitudes, longitudes), radius_km)
+
+    # Function to find the k nearest stations to each (latitude, longitude) query
+    # Searches a radius expected to hold k stations and doubles it for the queries that found
+    # fewer; once k stations lie within the radius, no station outside it can be nearer. A query
+    # stops early only once its radius reaches every station (far-away queries included).
+    # Returns (positions, distances_km) of shape (queries, k), padded with -1 / inf when the index
+    # holds fewer stations. exclude gives one index position per query to skip (the query's own
+    # station); other stations at the same coordinates still count as neighbors.
+    def query_knn(self, latitudes, longitudes, k, exclude=None):
+        query_xy = self._project(latitudes, longitudes)
+        num_queries = len(query_xy)
+        positions = np.full((num_queries, k), -1, dtype=np.int64)
+        distances = np.full((num_queries, k), np.inf)
+        if exclude is not None:
+            exclude = np.asarray(exclude, dtype=np.int64)
+        wanted = min(k + (1 if exclude is not None else 0), len(self.xy))
+        if wanted == 0 or num_queries == 0:
+            return positions, distances
+
+        # Cells hold about two stations, so this radius is expected to cover 2 (k + 1) of them
+        radius = self.cell_km * math.sqrt((k + 1) / math.pi)
+        # Per query: distance to the stations' bounding box plus its diagonal reaches every station
+        low, high = self.xy.min(axis=0), self.xy.max(axis=0)
+        to_box = np.hypot(*np.maximum(np.maximum(low - query_xy, query_xy - high), 0).T)
+        max_radius = to_box + float(np.hypot(*(high - low))) + self.cell_km
+        pending = np.arange(num_queries)
+        while len(pending):
+            queries, points, found = self._pairs_within(query_xy[pending], radius)
+            if exclude is not None:
+                keep = points != exclude[pending[queries]]
+                queries, points, found = queries[keep], points[keep], found[keep]
+            counts = np.bincount(queries, minlength=len(pending))
+            done = (counts >= k) | (radius >= max_radius[pending])
+            # Rank of each pair within its query's (already distance-sorted) group
+            group_start = np.concatenate([[0], np.cumsum(counts)[:-1]])
+            rank = np.arange(len(queries)) - group_start[queries]
+            take = done[queries] & (rank < k)
+            rows = pending[queries[take]]
+            positions[rows, rank[take]] = points[take]
+            distances[rows, rank[take]] = found[take]
+            pending = pending[~done]
+            radius *= 2
+        return positions, distances
+
+    # Function to find each indexed station's k nearest other stations
+    # Returns (positions, distances_km) like query_knn, one row per station in index order.
+    def station_knn(self, k):
+        return self.query_knn(self.latitudes, self.longitudes, k, exclude=np.arange(len(self.xy)))
+
+    # Function to build an index over a subset of the stations (positions into this index)
+    def subset(self, positions, cell_km=None):
+        return StationIndex(self.latitudes[positions], self.longitudes[positions], self.ids[positions], cell_km)
+
+# Function to pick geographic lattice neighbors for graph nodes from their station IDs
+# node_labels maps node -> station ID; each node backed by an indexed station gets its k nearest
+# fellow nodes (nearest first), replacing the index-modulo ring of the Watts-Strogatz lattice.
+def geographic_neighbors(index, node_labels, k):
+    node_of = {station_id: node for node, station_id in node_labels.items()}
+    position_of = {station_id: i for i, station_id in enumerate(index.ids.tolist())}
+    nodes = [node for node, station_id in node_labels.items() if station_id in position_of]
+    if not nodes:
+        return {}
+
+    # Index only the stations in the graph so neighbors are always graph nodes
+    graph_index = index.subset(np.array([position_of[node_labels[node]] for node in nodes]))
+    nearest, _ = graph_index.station_knn(k)
+    return {node: [node_of[graph_index.ids[p]] for p in row if p >= 0] for node, row in zip(nodes, nearest.tolist())}
+
+# Function to suggest expansion candidates: stations within radius_km of a cluster but not in it
+# Returns one list of station IDs per cluster, nearest first; nodes without a station are ignored.
+def expansion_candidates(index, clusters, node_labels, radius_km=1.0):
+    position_of = {station_id: i for i, station_id in enumerate(index.ids.tolist())}
+    candidates = []
+    for cluster in clusters:
+        member_ids = {node_labels.get(node) for node in cluster}
+        positions = [position_of[s] for s in member_ids if s in position_of]
+        if not positions:
+            candidates.append([])
+            continue
+        _, points, distances = index.query_radius(index.latitudes[positions], index.longitudes[positions], radius_km)
+        nearest = {}
+        for point, distance in zip(points.tolist(), distances.tolist()):
+            station_id = index.ids[point].item()
+            if station_id not in member_ids and distance < nearest.get(station_id, math.inf):
+                nearest[station_id] = distance
+        candidates.append(sorted(nearest, key=lambda s: (nearest[s], s)))
+    return candidates
@@ -0,0 +1,134 @@
+import argparse
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from .cluster_analysis import cluster_metrics
+from .communities import detect_communities, COMMUNITY_METHODS
+from .csr_graph import CSRGraph
+from .path_length import average_path_length
+from .watts_strogatz import watts_strogatz_graph
+
+# Columns that identify one configuration; rows with the same key are skipped on resume
+SWEEP_KEY_COLUMNS = ['n', 'k', 'p', 'seed', 'method']
+# Every column of a results row, in run_config order
+SWEEP_RESULT_COLUMNS = SWEEP_KEY_COLUMNS + ['num_edges', 'avg_path_length', 'avg_clustering', 'num_clusters', 'modularity',
+                                            'service_clusters', 'marketing_clusters', 'expansion_clusters', 'runtime']
+
+# Function to expand grids of n, k, p and seeds into configuration dicts (k >= n is skipped)
+def sweep_configs(n_values, k_values, p_values, seeds=(0,), method='louvain'):
+    return [{'n': int(n), 'k': int(k), 'p': float(p), 'seed': int(seed), 'method': method}
+            for n, k, p, seed in itertools.product(n_values, k_values, p_values, seeds)
+            if k < n]
+
+def _config_key(config):
+    return (int(config['n']), int(config['k']), float(config['p']), int(config['seed']), str(config['method']))
+
+# Function to run one configuration: build the graph, detect clusters and compute the metrics
+# networkGraph.py prints for one iteration, returned as a flat row for the results table
+def run_config(config):
+    start = time.perf_counter()
+    G = watts_strogatz_graph(config['n'], config['k'], config['p'], seed=config['seed'])
+    clusters = detect_communities(G, method=config['method'], seed=config['seed'])
+    metrics = cluster_metrics(G, clusters)
+
+    row = dict(config)
+    row.update({
+        'num_edges': G.number_of_edges(),
+        'avg_path_length': average_path_length(G, seed=config['seed']),
+        'avg_clustering': CSRGraph.from_networkx(G).average_clustering(),
+        'num_clusters': len(clusters),
+        'modularity': clusters.modularity,
+        # Same thresholds as analyze_clusters in networkGraph.py
+        'service_clusters': sum(m['density'] > 0.1 for m in metrics),
+        'marketing_clusters': sum(m['density'] < 0.05 for m in metrics),
+        'expansion_clusters': sum(m['size'] < 10 for m in metrics),
+        'runtime': time.perf_counter() - start,
+    })
+    return row
+
+# Function to read an existing results table (.csv or .parquet), or None if there is none yet
+def read_results(path):
+    if not os.path.exists(path):
+        return None
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
+
+# Function to fail before any configuration runs when a .parquet results table cannot be written
+def _check_results_format(path):
+    import importlib.util
+    if path.endswith('.parquet') and not any(importlib.util.find_spec(engine) for engine in ('pyarrow', 'fastparquet')):
+        raise ImportError(f"writing {path} needs the optional 'pyarrow' or 'fastparquet' package; "
+                          "install one or use a .csv results path")
+
+# Function to add one finished row to the results table
+# CSV rows are appended so a killed sweep keeps everything finished so far; Parquet cannot be
+# appended to, so the table is rewritten to a temporary file and swapped in.
+def _append_result(path, row):
+    frame = pd.DataFrame([row])
+    if path.endswith('.parquet'):
+        existing = read_results(path)
+        if existing is not None:
+            frame = pd.concat([existing, frame], ignore_index=True)
+        frame.to_parquet(path + '.tmp', index=False)
+        os.replace(path + '.tmp', path)
+    else:
+        frame.to_csv(path, mode='a', header=not os.path.exists(path), index=False)
+
+# Function to run every configuration not already in the results table, in a process pool
+# workers=1 runs in-process; any other value (None = all cores) uses a process pool, one
+# configuration per task. Returns the full results table, including rows from earlier runs
+# (an empty table with SWEEP_RESULT_COLUMNS when nothing has been run).
+def run_sweep(configs, results_path='sweep_results.csv', workers=None):
+    _check_results_format(results_path)
+    existing = read_results(results_path)
+    done = set()
+    if existing is not None:
+        done = {_config_key(row) for row in existing[SWEEP_KEY_COLUMNS].to_dict('records')}
+    pending = [config for config in configs if _config_key(config) not in done]
+    print(f"{len(configs)} configurations, {len(configs) - len(pending)} already done, {len(pending)} to run")
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for config in pending:
+            _append_result(results_path, run_config(config))
+    elif pending:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(run_config, config) for config in pending]
+            for finished, future in enumerate(as_completed(futures), 1):
+                # Rows are written by the parent only, in completion order
+                row = future.result()
+                _append_result(results_path, row)
+                print(f"  [{finished}/{len(pending)}] n={row['n']} k={row['k']} p={row['p']} seed={row['seed']} ({row['runtime']:.2f}s)")
+
+    results = read_results(results_path)
+    return results if results is not None else pd.DataFrame(columns=SWEEP_RESULT_COLUMNS)
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='divvy_network sweep', description="Run a Watts-Strogatz (n, k, p) parameter sweep")
+    parser.add_argument('--n', type=int, nargs='+', required=True, help="numbers of nodes")
+    parser.add_argument('--k', type=int, nargs='+', required=True, help="nearest-neighbor counts")
+    parser.add_argument('--p', type=float, nargs='+', required=True, help="rewiring probabilities")
+    parser.add_argument('--seeds', type=int, nargs='+', default=[0], help="random seeds (one run per seed)")
+    parser.add_argument('--method', default='louvain', choices=sorted(COMMUNITY_METHODS), help="community detection method")
+    parser.add_argument('--output', default='sweep_results.csv', help="results table (.csv or .parquet)")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores)")
+    return parser.parse_args(argv)
+
+# Function to run the sweep from the command line
+# Example: python -m divvy_network sweep --n 100 500 --k 2 4 6 --p 0.01 0.1 0.5 --seeds 0 1 2
+def main(argv=None):
+    args = _parse_args(argv)
+    configs = sweep_configs(args.n, args.k, args.p, args.seeds, args.method)
+    if not configs:
+        print("No configurations to run: the grid is empty or every k is >= n")
+        return
+    results = run_sweep(configs, args.output, args.workers)
+    print(results.groupby(['n', 'k', 'p'])[['avg_path_length', 'avg_clustering', 'num_clusters']].mean())
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+import hashlib
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from .divvy_loader import load_trip_pair_counts, load_station_names
+
+# Cache directory used when none is given; sits next to the source CSV
+CACHE_DIR_NAME = '.divvy_cache'
+
+# Function to key a cache entry by the source file's path, size and modification time
+# Hashing path/size/mtime instead of the contents keeps warm starts in the milliseconds
+# even for multi-GB exports; any rewrite of the CSV changes the mtime and so the key.
+def trip_cache_key(file_path):
+    stat = os.stat(file_path)
+    source = f"{os.path.abspath(file_path)}|{stat.st_size}|{stat.st_mtime_ns}"
+    return hashlib.sha1(source.encode('utf-8')).hexdigest()[:16]
+
+def _cache_entry_prefix(file_path):
+    return os.path.splitext(os.path.basename(file_path))[0] + '-'
+
+def _default_cache_dir(file_path):
+    return os.path.join(os.path.dirname(os.path.abspath(file_path)), CACHE_DIR_NAME)
+
+# Function to write the aggregated tables as one .npy file per column
+def _write_cache_entry(entry_dir, trip_pair_counts, stations):
+    tmp_dir = entry_dir + '.tmp'
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    np.save(os.path.join(tmp_dir, 'from_ids.npy'), trip_pair_counts['FROM STATION ID'].to_numpy(dtype=np.int32))
+    np.save(os.path.join(tmp_dir, 'to_ids.npy'), trip_pair_counts['TO STATION ID'].to_numpy(dtype=np.int32))
+    np.save(os.path.join(tmp_dir, 'counts.npy'), trip_pair_counts['COUNT'].to_numpy(dtype=np.int64))
+    np.save(os.path.join(tmp_dir, 'station_ids.npy'), stations['STATION ID'].to_numpy(dtype=np.int32))
+    # Fixed-width unicode so the names load without pickle and can be memory-mapped
+    np.save(os.path.join(tmp_dir, 'station_names.npy'), stations['STATION NAME'].to_numpy(dtype=str))
+
+    # Rename last so a crashed write never leaves a half-written entry behind
+    os.replace(tmp_dir, entry_dir)
+
+# Function to open a cache entry with its pair table memory-mapped, not read into memory
+# The ID and count columns wrap the mapped arrays without copying (the nullable Int32 columns
+# only allocate their all-False mask); pages are read on first access. The small station table
+# is converted to a categorical, which does copy.
+def _read_cache_entry(entry_dir):
+    def column(name):
+        return np.load(os.path.join(entry_dir, name + '.npy'), mmap_mode='r')
+
+    def station_ids(name):
+        values = column(name)
+        return pd.arrays.IntegerArray(values, np.zeros(len(values), dtype=bool), copy=False)
+
+    trip_pair_counts = pd.DataFrame({
+        'FROM STATION ID': station_ids('from_ids'),
+        'TO STATION ID': station_ids('to_ids'),
+        'COUNT': column('counts'),
+    }, copy=False)
+    stations = pd.DataFrame({
+        'STATION ID': station_ids('station_ids'),
+        'STATION NAME': pd.Categorical(column('station_names')),
+    })
+    return trip_pair_counts, stations
+
+# Function to load the aggregated trip pair counts and the station table, from cache when possible
+# The station table's row position is the station's index, so it doubles as the
+# ID <-> name <-> index map. Entries for older versions of the same CSV are removed.
+# chunksize only bounds memory on a cold load; chunked and single-pass loads give identical
+# tables, so it is not part of the cache key.
+def load_cached_trip_tables(file_path, chunksize=None, cache_dir=None):
+    cache_dir = cache_dir or _default_cache_dir(file_path)
+    prefix = _cache_entry_prefix(file_path)
+    entry_dir = os.path.join(cache_dir, prefix + trip_cache_key(file_path))
+
+    if os.path.isdir(entry_dir):
+        return _read_cache_entry(entry_dir)
+
+    trip_pair_counts = load_trip_pair_counts(file_path, chunksize=chunksize)
+    stations = load_station_names(file_path, chunksize=chunksize)
+
+    # Caching is best effort: a read-only data directory or a full disk still returns the tables
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        for name in os.listdir(cache_dir):
+            if name.startswith(prefix) and '-' not in name[len(prefix):]:
+                shutil.rmtree(os.path.join(cache_dir, name), ignore_errors=True)
+        _write_cache_entry(entry_dir, trip_pair_counts, stations)
+    except OSError:
+        shutil.rmtree(entry_dir + '.tmp', ignore_errors=True)
+
+    return trip_pair_counts, stations
@@ -0,0 +1,106 @@
+import itertools
+import numpy as np
+import random
+
+# Function to map station trip pairs to (src, dst, weight) NumPy arrays without a Python object per trip
+def generate_station_trip_edge_arrays(df, station_labels):
+    # pandas is only needed here; importing it lazily keeps the graph-growth path light
+    import pandas as pd
+    id_to_index = {v: k for k, v in station_labels.items()}
+    station_ids = pd.Index(list(id_to_index.keys()))
+    node_indices = np.fromiter(id_to_index.values(), dtype=np.int64, count=len(id_to_index))
+
+    # get_indexer gives -1 for station IDs (and NaNs) that have no node label
+    from_pos = station_ids.get_indexer(df['FROM STATION ID'])
+    to_pos = station_ids.get_indexer(df['TO STATION ID'])
+    mask = (from_pos >= 0) & (to_pos >= 0)
+    src = node_indices[from_pos[mask]]
+    dst = node_indices[to_pos[mask]]
+
+    # Count trips per (src, dst) pair by packing both indices into one int64 key
+    num_nodes = int(node_indices.max()) + 1 if len(node_indices) else 1
+    if 'COUNT' in df.columns:
+        # Pre-aggregated pair counts (divvy_loader.load_trip_pair_counts): sum them instead
+        keys, inverse = np.unique(src * num_nodes + dst, return_inverse=True)
+        weight = np.bincount(inverse, weights=df['COUNT'].to_numpy()[mask], minlength=len(keys)).astype(np.int64)
+    else:
+        keys, weight = np.unique(src * num_nodes + dst, return_counts=True)
+    return keys // num_nodes, keys % num_nodes, weight
+
+# Function to generate a list of edges with weights based on station trip pairs
+def generate_station_trip_edges(df, station_labels):
+    src, dst, weight = generate_station_trip_edge_arrays(df, station_labels)
+    return list(zip(src.tolist(), dst.tolist(), weight.tolist()))
+
+# Function to index trip edges by (from, to) so neighbor checks are O(1) lookups
+def build_trip_edge_index(station_trip_edges):
+    # (src, dst, weight) arrays from generate_station_trip_edge_arrays
+    if isinstance(station_trip_edges, tuple) and len(station_trip_edges) == 3 and isinstance(station_trip_edges[0], np.ndarray):
+        src, dst, weight = station_trip_edges
+        return dict(zip(zip(src.tolist(), dst.tolist()), weight.tolist()))
+    # A later duplicate (from, to) pair overrides an earlier one, as in the old linear scan
+    return {(edge[0], edge[1]): edge[2] for edge in station_trip_edges}
+
+# Function to draw a node uniformly from those not yet adjacent to node (None if there are none)
+# Rejection sampling costs O(1) expected draws on sparse graphs instead of building an O(n)
+# candidate list per rewire; the dense fallback keeps the distribution uniform.
+def _random_non_neighbor(G, node, total_nodes, max_tries=32):
+    neighbors = G[node]
+    for _ in range(max_tries):
+        candidate = random.randrange(total_nodes)
+        if candidate != node and candidate not in neighbors:
+            return candidate
+    candidates = [n for n in range(total_nodes) if n != node and n not in neighbors]
+    return random.choice(candidates) if candidates else None
+
+# Function to return a node's lattice neighbors as (forward, backward) lists
+# Without lattice_neighbors these are the k // 2 ring neighbors on each side; with it (node ->
+# nearest nodes, e.g. spatial.geographic_neighbors) the k // 2 nearest are forward, the next
+# k // 2 backward, and nodes missing from it keep the ring.
+def _lattice_neighbors(node, total_nodes, k, lattice_neighbors=None):
+    half = k // 2
+    nearest = lattice_neighbors.get(node) if lattice_neighbors else None
+    if nearest is not None:
+        nearest = [n for n in nearest if n < total_nodes][:2 * half]
+        return nearest[:half], nearest[half:]
+    return ([(node + i) % total_nodes for i in range(1, half + 1)],
+            [(node - i) % total_nodes for i in range(1, half + 1)])
+
+# Custom function to incrementally expand a small-world graph with weighted edges
+# Pass an IncrementalGraphMetrics tracking G as metrics to keep its metrics up to date, and
+# lattice_neighbors to wire the lattice by real station proximity instead of node index.
+def expand_small_world_graph(G, station_trip_edges, new_nodes, k, p, metrics=None, lattice_neighbors=None):
+    num_existing_nodes = len(G.nodes)
+    total_nodes = num_existing_nodes + new_nodes
+
+    # Route additions through the tracker when there is one so it sees every new edge
+    graph = metrics if metrics is not None else G
+    graph.add_nodes_from(range(num_existing_nodes, total_nodes))
+
+    # Accept a prebuilt index so callers growing the graph repeatedly build it only once
+    if isinstance(station_trip_edges, dict):
+        edge_index = station_trip_edges
+    else:
+        edge_index = build_trip_edge_index(station_trip_edges)
+
+    for node in range(num_existing_nodes, total_nodes):
+        forward, backward = _lattice_neighbors(node, total_nodes, k, lattice_neighbors)
+        for neighbor, reverse_neighbor in itertools.zip_longest(forward, backward):
+            # Add edges based on station trip edges
+            weight = edge_index.get((node, neighbor))
+            if weight is not None:
+                graph.add_edge(node, neighbor, weight=weight)
+            weight = edge_index.get((node, reverse_neighbor))
+            if weight is not None:
+                graph.add_edge(node, reverse_neighbor, weight=weight)
+
+    # Rewiring process as per the small-world algorithm
+    for node in range(total_nodes):
+        for neighbor in _lattice_neighbors(node, total_nodes, k, lattice_neighbors)[0]:
+            if G.has_edge(node, neighbor) and (p > 0):
+                if random.random() < p:
+                    new_neighbor = _random_non_neighbor(G, node, total_nodes)
+                    if new_neighbor is not None:
+                        graph.add_edge(node, new_neighbor, weight=1)
+
+    return G
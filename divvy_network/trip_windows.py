@@ -0,0 +1,283 @@
+import argparse
+from collections import Counter, deque
+
+import networkx as nx
+import pandas as pd
+
+from .communities import detect_communities
+from .divvy_loader import iter_trips_by_start_time, DEFAULT_FILE_PATH, STATION_ID_COLUMNS
+from .trip_graph import generate_station_trip_edge_arrays
+
+# Sweeps of warm-started label propagation per window before communities are reported as they are
+MAX_LABEL_SWEEPS = 10
+
+# Undirected station graph of the trips in the active window, weighted by trip count
+# Trips are added and expired in batches; an edge appears when its first trip arrives and
+# disappears (with any station left without trips) when its last trip expires. Triangles,
+# clustering and degrees are updated per changed edge, and communities are refreshed by label
+# propagation started from the previous window's labels, touching only changed stations.
+class WindowedTripGraph:
+    def __init__(self):
+        self.G = nx.Graph()
+        self.triangles = {}
+        self.degree_counts = Counter()
+        self.clustering_sum = 0.0
+        self.labels = {}
+        self._touched = set()
+
+    def _add_node(self, node):
+        if node in self.G:
+            return
+        self.G.add_node(node)
+        self.triangles[node] = 0
+        self.degree_counts[0] += 1
+        self.labels[node] = node
+
+    def _remove_node(self, node):
+        self.G.remove_node(node)
+        del self.triangles[node]
+        del self.labels[node]
+        self._drop_degree(0)
+        self._touched.discard(node)
+
+    def _drop_degree(self, degree):
+        self.degree_counts[degree] -= 1
+        if self.degree_counts[degree] == 0:
+            del self.degree_counts[degree]
+
+    def _shift_degree(self, node, delta):
+        degree = self.G.degree(node)
+        self._drop_degree(degree)
+        self.degree_counts[degree + delta] += 1
+
+    def _local_clustering(self, node):
+        degree = len(self.G[node]) - (1 if node in self.G[node] else 0)
+        if degree < 2:
+            return 0.0
+        return 2 * self.triangles[node] / (degree * (degree - 1))
+
+    # Function to add or drop edge (u, v) and update triangles, clustering and degrees around it
+    def _toggle_edge(self, u, v, weight=None):
+        adding = weight is not None
+        self._touched.update((u, v))
+        if u == v:
+            # Self-loops count twice towards degree but, as in nx.clustering, not towards triangles
+            self._shift_degree(u, 2 if adding else -2)
+            if adding:
+                self.G.add_edge(u, v, weight=weight)
+            else:
+                self.G.remove_edge(u, v)
+            return
+
+        adj_u, adj_v = self.G[u], self.G[v]
+        smaller, larger = (adj_u, adj_v) if len(adj_u) < len(adj_v) else (adj_v, adj_u)
+        common = [w for w in smaller if w != u and w != v and w in larger]
+        affected = [u, v] + common
+        self.clustering_sum -= sum(self._local_clustering(w) for w in affected)
+
+        step = 1 if adding else -1
+        self._shift_degree(u, step)
+        self._shift_degree(v, step)
+        if adding:
+            self.G.add_edge(u, v, weight=weight)
+        else:
+            self.G.remove_edge(u, v)
+        self.triangles[u] += step * len(common)
+        self.triangles[v] += step * len(common)
+        for w in common:
+            self.triangles[w] += step
+
+        self.clustering_sum += sum(self._local_clustering(w) for w in affected)
+
+    # Function to add (sign=1) or expire (sign=-1) a batch of trips
+    # Trips are aggregated per station pair with generate_station_trip_edge_arrays first, so
+    # the graph changes once per pair rather than once per trip.
+    def apply_trips(self, trips, sign=1):
+        if len(trips) == 0:
+            return
+        station_ids = pd.unique(trips[STATION_ID_COLUMNS].to_numpy().ravel())
+        station_labels = {int(s): int(s) for s in station_ids if not pd.isna(s)}
+        if not station_labels:
+            return
+        src, dst, weight = generate_station_trip_edge_arrays(trips, station_labels)
+
+        for u, v, w in zip(src.tolist(), dst.tolist(), weight.tolist()):
+            if sign > 0:
+                self._add_node(u)
+                self._add_node(v)
+                if self.G.has_edge(u, v):
+                    self.G[u][v]['weight'] += w
+                else:
+                    self._toggle_edge(u, v, w)
+            else:
+                remaining = self.G[u][v]['weight'] - w
+                if remaining > 0:
+                    self.G[u][v]['weight'] = remaining
+                else:
+                    self._toggle_edge(u, v)
+                    for node in {u, v}:
+                        if len(self.G[node]) == 0:
+                            self._remove_node(node)
+
+    # Function to refresh community labels with weighted label propagation from the previous labels
+    # Only stations whose edges changed (and, transitively, neighbors whose label then changes) are
+    # revisited; ties keep the current label, then prefer the smallest one, so results are deterministic.
+    def update_communities(self, max_sweeps=MAX_LABEL_SWEEPS):
+        queue = deque(sorted(self._touched))
+        queued = set(queue)
+        budget = max_sweeps * max(len(self.G), 1)
+        while queue and budget > 0:
+            budget -= 1
+            node = queue.popleft()
+            queued.discard(node)
+            scores = Counter()
+            for neighbor, data in self.G[node].items():
+                if neighbor != node:
+                    scores[self.labels[neighbor]] += data['weight']
+            if not scores:
+                continue
+            best = max(scores.values())
+            current = self.labels[node]
+            if scores.get(current) == best:
+                continue
+            self.labels[node] = min(label for label, score in scores.items() if score == best)
+            for neighbor in self.G[node]:
+                if neighbor != node and neighbor not in queued:
+                    queue.append(neighbor)
+                    queued.add(neighbor)
+        self._touched.clear()
+
+    def communities(self):
+        groups = {}
+        for node, label in self.labels.items():
+            groups.setdefault(label, []).append(node)
+        return sorted((sorted(group) for group in groups.values()), key=lambda c: (-len(c), c))
+
+    # Function to summarize the active window's graph: size, degrees, clustering and communities
+    # communities=True uses the incremental label propagation above; a detect_communities method
+    # name (e.g. 'louvain') recomputes communities for the window with that method instead.
+    def summary(self, communities=True):
+        n = len(self.G)
+        num_edges = self.G.number_of_edges()
+        summary = {
+            'num_stations': n,
+            'num_edges': num_edges,
+            'num_trips': int(sum(w for _, _, w in self.G.edges(data='weight'))),
+            'avg_degree': 2 * num_edges / n if n else 0.0,
+            'max_degree': max(self.degree_counts) if self.degree_counts else 0,
+            # Clamped: add/remove round-off can leave a tiny negative sum when every triangle is gone
+            'avg_clustering': max(self.clustering_sum, 0.0) / n if n else 0.0,
+        }
+        if communities:
+            self.update_communities()
+            if isinstance(communities, str):
+                clusters = detect_communities(self.G, method=communities, seed=0)
+            else:
+                clusters = self.communities()
+            summary['num_communities'] = len(clusters)
+            summary['largest_community'] = len(clusters[0]) if clusters else 0
+            summary['modularity'] = nx.community.modularity(self.G, clusters) if num_edges else 0.0
+        return summary
+
+# Function to stream per-window graph summaries from trip chunks sorted by START TIME
+# window and step are pandas offsets ('1h', '1D', ...); step=None gives tumbling windows,
+# a step smaller than window gives sliding ones. A trip is in a window if it is under way
+# at any point of it (START TIME before the window ends, STOP TIME not before it starts).
+# Only trips of the active window are held in memory. With skip_empty, windows without
+# trips are skipped instead of yielding empty summaries.
+def stream_trip_windows(trip_chunks, window, step=None, skip_empty=True, communities=True):
+    window = pd.Timedelta(window)
+    step = window if step is None else pd.Timedelta(step)
+    graph = WindowedTripGraph()
+    chunks = iter(trip_chunks)
+    buffer = None
+    exhausted = False
+    active = []
+    window_start = None
+
+    while True:
+        # Take every trip starting before the window ends, reading further chunks as needed
+        window_end = None if window_start is None else window_start + window
+        started = []
+        while True:
+            if buffer is not None and len(buffer):
+                if window_start is None:
+                    window_start = buffer['START TIME'].iloc[0].floor(step)
+                    window_end = window_start + window
+                split = int(buffer['START TIME'].searchsorted(window_end, side='left'))
+                started.append(buffer.iloc[:split])
+                buffer = buffer.iloc[split:]
+                if len(buffer):
+                    break
+            if exhausted:
+                break
+            try:
+                buffer = next(chunks)
+            except StopIteration:
+                exhausted = True
+        if window_start is None:
+            return
+
+        started = [part for part in started if len(part)]
+        if started:
+            new_trips = pd.concat(started, ignore_index=True)
+            graph.apply_trips(new_trips, sign=1)
+            active.append(new_trips)
+
+        # Expire trips that stopped before this window started
+        expired, still_active = [], []
+        for part in active:
+            done = (part['STOP TIME'] < window_start).to_numpy()
+            if done.any():
+                expired.append(part[done])
+                part = part[~done]
+            if len(part):
+                still_active.append(part)
+        active = still_active
+        if expired:
+            graph.apply_trips(pd.concat(expired, ignore_index=True), sign=-1)
+
+        if active or not skip_empty:
+            summary = {'window_start': window_start, 'window_end': window_end,
+                       'active_trips': sum(len(part) for part in active)}
+            summary.update(graph.summary(communities))
+            yield summary
+
+        pending = buffer is not None and len(buffer)
+        if exhausted and not pending and not active:
+            return
+        next_start = window_start + step
+        if skip_empty and not active and pending:
+            # Jump to the first window that contains the next trip
+            gap = buffer['START TIME'].iloc[0] - window - window_start
+            next_start = window_start + step * max(1, gap // step + 1)
+        window_start = next_start
+
+# Function to stream per-window summaries straight from a Divvy CSV
+def stream_divvy_windows(file_path=DEFAULT_FILE_PATH, window='1h', step=None, chunksize=100_000,
+                         presorted=False, skip_empty=True, communities=True):
+    trips = iter_trips_by_start_time(file_path, chunksize, presorted)
+    yield from stream_trip_windows(trips, window, step, skip_empty, communities)
+
+# Function to print (and optionally save) per-window summaries from the command line
+# Example: python -m divvy_network windows --window 1D --step 6h --output windows.csv
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='divvy_network windows', description="Per-window station graph summaries from a Divvy trip CSV")
+    parser.add_argument('--file', default=DEFAULT_FILE_PATH, help="Divvy trip CSV")
+    parser.add_argument('--window', default='1h', help="window length, e.g. 1h or 1D")
+    parser.add_argument('--step', default=None, help="slide step (default: tumbling windows)")
+    parser.add_argument('--presorted', action='store_true', help="the CSV is already sorted by START TIME")
+    parser.add_argument('--communities', default='incremental',
+                        help="'incremental' label propagation, 'none', or a detect_communities method")
+    parser.add_argument('--output', default=None, help="write the summaries to this CSV")
+    args = parser.parse_args(argv)
+
+    communities = {'incremental': True, 'none': False}.get(args.communities, args.communities)
+    summaries = pd.DataFrame(stream_divvy_windows(args.file, args.window, args.step, presorted=args.presorted,
+                                                  communities=communities))
+    print(summaries.to_string(max_rows=20))
+    if args.output:
+        summaries.to_csv(args.output, index=False)
+
+if __name__ == '__main__':
+    main()
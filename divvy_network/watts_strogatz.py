@@ -0,0 +1,64 @@
+import numpy as np
+
+# Rounds of rejection sampling before a still-colliding rewire keeps its original edge
+MAX_REWIRE_ROUNDS = 64
+
+def _edge_keys(low, high, n):
+    return np.minimum(low, high) * n + np.maximum(low, high)
+
+# Function to generate Watts-Strogatz edges as (src, dst) int64 arrays
+# The ring lattice joins each node to its k // 2 nearest neighbors on each side (as in
+# nx.watts_strogatz_graph, odd k rounds down). Each lattice edge (u, v) is rewired with
+# probability p to (u, w), with w drawn uniformly in bulk; proposals that would create a
+# self-loop or a duplicate edge are rejected and redrawn. Same seed, same edges.
+def watts_strogatz_edges(n, k, p, seed=None):
+    if k > n:
+        raise ValueError("k > n, choose smaller k or larger n")
+    rng = np.random.default_rng(seed)
+    if k == n:
+        src, dst = np.triu_indices(n, 1)
+        return src.astype(np.int64), dst.astype(np.int64)
+
+    nodes = np.arange(n, dtype=np.int64)
+    src = np.tile(nodes, k // 2)
+    dst = (src + np.repeat(np.arange(1, k // 2 + 1, dtype=np.int64), n)) % n
+    if p <= 0 or len(src) == 0:
+        return src, dst
+
+    pending = np.flatnonzero(rng.random(len(src)) < p)
+    # Nodes already adjacent to everything cannot be rewired (nx skips them too)
+    degree = np.bincount(src, minlength=n) + np.bincount(dst, minlength=n)
+    pending = pending[degree[src[pending]] < n - 1]
+
+    for _ in range(MAX_REWIRE_ROUNDS):
+        if len(pending) == 0:
+            break
+        proposals = rng.integers(0, n, size=len(pending))
+        u = src[pending]
+
+        # Like nx, a new endpoint may not hit any current edge, including the one being rewired
+        existing = np.sort(_edge_keys(src, dst, n))
+
+        keys = _edge_keys(u, proposals, n)
+        hits = np.searchsorted(existing, keys)
+        collides = (hits < len(existing)) & (existing[np.minimum(hits, len(existing) - 1)] == keys)
+        ok = (proposals != u) & ~collides
+        # Two proposals for the same new edge: only the first one wins
+        _, first = np.unique(np.where(ok, keys, -1 - np.arange(len(keys))), return_index=True)
+        unique_ok = np.zeros(len(keys), dtype=bool)
+        unique_ok[first] = True
+        ok &= unique_ok
+
+        dst[pending[ok]] = proposals[ok]
+        pending = pending[~ok]
+
+    return src, dst
+
+# Function to build a Watts-Strogatz nx.Graph from the vectorized edge generator
+def watts_strogatz_graph(n, k, p, seed=None):
+    import networkx as nx
+    src, dst = watts_strogatz_edges(n, k, p, seed)
+    G = nx.Graph()
+    G.add_nodes_from(range(n))
+    G.add_edges_from(zip(src.tolist(), dst.tolist()))
+    return G
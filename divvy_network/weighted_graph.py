@@ -0,0 +1,176 @@
+import heapq
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import networkx as nx
+
+# Edge weightings for the directed trip graph: edge attribute used as the Dijkstra distance
+# 'count' makes busy links short (1 / trips), 'duration' uses the mean TRIP DURATION in seconds.
+TRIP_WEIGHTS = ('count', 'duration')
+
+# Function to build a directed station graph from per-pair trip stats (divvy_loader.load_trip_pair_stats)
+# Every edge carries 'count' (trips), 'duration' (mean seconds) and 'distance', the Dijkstra length
+# for the chosen weighting. Self-loops (round trips) are kept for strengths but never lie on paths.
+def build_trip_digraph(pair_stats, weight='count'):
+    if weight not in TRIP_WEIGHTS:
+        raise ValueError(f"weight must be one of {TRIP_WEIGHTS}, got {weight!r}")
+    G = nx.DiGraph()
+    for u, v, count, duration in zip(pair_stats['FROM STATION ID'].tolist(), pair_stats['TO STATION ID'].tolist(),
+                                     pair_stats['COUNT'].tolist(), pair_stats['MEAN DURATION'].tolist()):
+        distance = 1.0 / count if weight == 'count' else float(duration)
+        G.add_edge(int(u), int(v), count=int(count), duration=float(duration), distance=distance)
+    G.graph['weight'] = weight
+    return G
+
+# Function to return each station's in- and out-strength (sum of incoming/outgoing edge weights)
+def strength_distributions(G, weight='count'):
+    import pandas as pd
+    nodes = list(G)
+    return pd.DataFrame({
+        'IN STRENGTH': [G.in_degree(n, weight=weight) for n in nodes],
+        'OUT STRENGTH': [G.out_degree(n, weight=weight) for n in nodes],
+    }, index=pd.Index(nodes, name='STATION ID'))
+
+# Function to compute the average weighted clustering coefficient of the directed graph
+# Uses nx's directed, weighted definition (Fagiolo), with weights normalized by the largest one.
+def weighted_average_clustering(G, weight='count'):
+    if len(G) == 0:
+        return 0.0
+    return nx.average_clustering(G, weight=weight)
+
+# Function to turn G into integer adjacency lists [(neighbor, distance, demand), ...] for the Dijkstra workers
+def _distance_adjacency(G, distance='distance', demand='count'):
+    nodes = list(G)
+    index = {node: i for i, node in enumerate(nodes)}
+    adjacency = [[(index[v], data[distance], data.get(demand, 0)) for v, data in G[u].items() if v != u]
+                 for u in nodes]
+    return nodes, adjacency
+
+# Function to run Dijkstra from source with a binary heap, counting shortest paths as it goes
+# Returns (order, dist, sigma, preds): nodes in settled order, their distances, the number of
+# shortest paths reaching them and their predecessors on those paths.
+def _dijkstra(adjacency, source):
+    dist = {}
+    sigma = {source: 1}
+    preds = {source: []}
+    seen = {source: 0.0}
+    order = []
+    heap = [(0.0, source)]
+    while heap:
+        d, node = heapq.heappop(heap)
+        if node in dist:
+            continue
+        dist[node] = d
+        order.append(node)
+        for neighbor, length, _ in adjacency[node]:
+            candidate = d + length
+            if neighbor in dist:
+                continue
+            best = seen.get(neighbor)
+            if best is None or candidate < best:
+                seen[neighbor] = candidate
+                sigma[neighbor] = sigma[node]
+                preds[neighbor] = [node]
+                heapq.heappush(heap, (candidate, neighbor))
+            elif candidate == best:
+                sigma[neighbor] += sigma[node]
+                preds[neighbor].append(node)
+    return order, dist, sigma, preds
+
+# Adjacency and demand shared with worker processes, set once per worker by _init_dijkstra_worker
+_worker_adjacency = None
+_worker_demand = None
+
+def _init_dijkstra_worker(adjacency, demand):
+    global _worker_adjacency, _worker_demand
+    _worker_adjacency = adjacency
+    _worker_demand = demand
+
+# Function to run one batch of sources: summed distances and reached pairs, plus flow dependencies
+# Flow dependencies follow Brandes' accumulation, with each target weighted by the trips the source
+# sends to it, so a station scores the trips that would pass through it on shortest routes.
+def _dijkstra_batch(sources, adjacency=None, demand=None):
+    adjacency = _worker_adjacency if adjacency is None else adjacency
+    demand = _worker_demand if demand is None else demand
+    total_distance = 0.0
+    reached_pairs = 0
+    flow = [0.0] * len(adjacency)
+    for source in sources:
+        order, dist, sigma, preds = _dijkstra(adjacency, source)
+        total_distance += sum(dist.values())
+        reached_pairs += len(order) - 1
+        if demand is None:
+            continue
+        trips_from_source = demand[source]
+        delta = dict.fromkeys(order, 0.0)
+        for node in reversed(order):
+            coefficient = (trips_from_source.get(node, 0) + delta[node]) / sigma[node]
+            for pred in preds[node]:
+                delta[pred] += sigma[pred] * coefficient
+            if node != source:
+                flow[node] += delta[node]
+    return total_distance, reached_pairs, flow
+
+# Function to run batched Dijkstra from all (or num_sources sampled) sources
+# workers=1 runs in-process; any other value (None = all cores) splits the sources into
+# batches for a process pool that receives the adjacency once per worker.
+def _multi_source_dijkstra(G, num_sources=None, seed=None, workers=1, with_flow=False):
+    nodes, adjacency = _distance_adjacency(G)
+    demand = None
+    if with_flow:
+        demand = [{v: weight for v, _, weight in neighbors} for neighbors in adjacency]
+
+    sources = list(range(len(nodes)))
+    if num_sources is not None and num_sources < len(sources):
+        sources = random.Random(seed).sample(sources, num_sources)
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        results = [_dijkstra_batch(sources, adjacency, demand)]
+    else:
+        batches = [sources[i::workers] for i in range(workers)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_dijkstra_worker,
+                                 initargs=(adjacency, demand)) as executor:
+            results = list(executor.map(_dijkstra_batch, batches))
+
+    total_distance = sum(r[0] for r in results)
+    reached_pairs = sum(r[1] for r in results)
+    flow = [sum(values) for values in zip(*(r[2] for r in results))]
+    return nodes, sources, total_distance, reached_pairs, flow
+
+# Function to compute the mean Dijkstra distance over all ordered station pairs that are connected
+# The directed trip graph is rarely strongly connected, so unreachable pairs are left out (and the
+# share of reachable pairs is returned alongside). num_sources samples sources on large graphs.
+def weighted_average_path_length(G, num_sources=None, seed=None, workers=1):
+    n = len(G)
+    if n < 2:
+        return 0.0, 0.0
+    _, sources, total_distance, reached_pairs, _ = _multi_source_dijkstra(G, num_sources, seed, workers)
+    average = total_distance / reached_pairs if reached_pairs else 0.0
+    return average, reached_pairs / (len(sources) * (n - 1))
+
+# Function to estimate how many trips pass through each station if every trip took the shortest route
+# Demand between two stations is their observed trip count; routes are Dijkstra paths over the
+# 'distance' attribute, split evenly over tied shortest paths. Sampled sources are scaled up to the full station set.
+def flow_centrality(G, num_sources=None, seed=None, workers=1):
+    if len(G) == 0:
+        return {}
+    nodes, sources, _, _, flow = _multi_source_dijkstra(G, num_sources, seed, workers, with_flow=True)
+    scale = len(nodes) / len(sources)
+    return {node: value * scale for node, value in zip(nodes, flow)}
+
+# Function to compute the weighted, directed metrics of the trip graph in one call
+# Path length and flow centrality share a single batched Dijkstra run.
+def weighted_network_metrics(G, num_sources=None, seed=None, workers=1):
+    weight = G.graph.get('weight', 'count')
+    n = len(G)
+    nodes, sources, total_distance, reached_pairs, flow = _multi_source_dijkstra(G, num_sources, seed, workers, with_flow=True)
+    scale = n / len(sources) if sources else 0.0
+    return {
+        'strengths': strength_distributions(G, weight),
+        'avg_clustering': weighted_average_clustering(G, weight),
+        'avg_path_length': total_distance / reached_pairs if reached_pairs else 0.0,
+        'reachable_pairs': reached_pairs / (len(sources) * (n - 1)) if n > 1 else 0.0,
+        'flow_centrality': {node: value * scale for node, value in zip(nodes, flow)},
+    }